@@ -1,12 +1,7 @@
 import streamlit as st
 from lib.http_requests import fetch_url
+from lib.http_client import clear_cache, connection_stats
 from lib.security_headers import check_security_headers, analyze_cookies
-from lib.directory_enumeration import directory_enumeration
-from lib.injection_tests import test_sqli
-from lib.content_analysis import analyze_content
-from lib.authentication_tests import test_authentication
-from lib.performance_tests import performance_test_menu
-from lib.subdomain_discovery import run_subdomain_discovery
 from front.SecHeadReport import display_security_report
 
 # Page configuration
@@ -60,12 +55,14 @@ def main():
     # Sidebar for inputs
     with st.sidebar:
         st.header("Scan Configuration")
-        url = st.text_input("Enter the URL to scan", "https://example.com")
+        urls = st.text_area("Enter the URLs to scan (one per line)", "https://example.com").split()
         st.write("Select the types of tests you want to perform:")
         check_security = st.checkbox("Check security headers")
         check_cookies = st.checkbox("Analyze cookies")
         check_directories = st.checkbox("Enumerate directories")
+        async_directories = st.checkbox("Use async directory enumeration")
         check_sqli = st.checkbox("Test SQL Injection")
+        check_blind_sqli = st.checkbox("Include time-based blind SQL Injection")
         check_content = st.checkbox("Analyze content")
         check_authentication = st.checkbox("Test authentication")
         check_performance = st.checkbox("Performance test")
@@ -78,55 +75,104 @@ def main():
     results_placeholder = st.empty()
 
     if run_scan:
-        if not url:
+        if not urls:
             st.error("Please enter a valid URL.")
             return
+        clear_cache()
+
+        if len(urls) > 1:
+            # Vários alvos em paralelo, cada um com o próprio ScanContext
+            from lib.multi_scan import run_targets
+            scans = [name for name, selected in (("directories", check_directories), ("sqli", check_sqli),
+                                                 ("blind_sqli", check_sqli and check_blind_sqli),
+                                                 ("authentication", check_authentication)) if selected]
+            # Só os módulos de multi_scan rodam por alvo; o restante vale apenas para uma URL
+            skipped = [label for label, selected in (("security headers", check_security), ("cookies", check_cookies),
+                                                     ("async directory enumeration", async_directories),
+                                                     ("content analysis", check_content),
+                                                     ("performance test", check_performance),
+                                                     ("subdomain discovery", check_subdomains)) if selected]
+            if skipped:
+                st.warning(f"Not available when scanning several URLs, skipped: {', '.join(skipped)}. "
+                           "Run a single URL to include them.")
+            if not scans:
+                st.error("Select directories, SQL Injection or authentication to scan several URLs.")
+                return
+            st.write(f"Running {', '.join(scans)} for {len(urls)} targets...")
+            contexts = run_targets(urls, scans=scans)
+            results_placeholder.write("## Scan Results")
+            for target, context in contexts.items():
+                st.write(f"### {target}")
+                st.write(context.results)
+                st.write(context.summary())
+            return
 
+        url = urls[0]
         st.write(f"Running scans for {url}...")
 
+        # Estado isolado por execução: rodar de novo no mesmo processo não reaproveita nada do scan anterior
+        from lib.scan_context import ScanContext
         results = {}
-        if check_security:
-            response = fetch_url(url)
-            if response:
-                security_report = check_security_headers(response.headers, url)
-                results["Security Headers"] = security_report
-
-        if check_cookies:
-            response = fetch_url(url)
-            if response:
-                results["Cookies"] = analyze_cookies(response.headers)
-
-        if check_directories:
-            st.write("Enumerating directories...")
-            directory_enumeration(url)
-            results["Directories"] = "Directory enumeration completed."
-
-        if check_sqli:
-            st.write("Testing SQL Injection...")
-            test_sqli(url)
-            results["SQL Injection"] = "SQL Injection test completed."
-
-        if check_content:
-            response = fetch_url(url)
-            if response:
-                st.write("Analyzing content...")
-                content_results = analyze_content(response.text)
-                results["Content"] = content_results
-
-        if check_authentication:
-            st.write("Testing authentication...")
-            test_authentication(url)
-            results["Authentication"] = "Authentication test completed."
-
-        if check_performance:
-            st.write("Testing performance...")
-            performance_test_menu(url)
-            results["Performance"] = "Performance test completed."
-
-        if check_subdomains:
-            st.write("Discovering subdomains...")
-            subdomain_results = run_subdomain_discovery(url)
-            results["Subdomains"] = subdomain_results
+        with ScanContext(url) as context:
+            # Página inicial baixada uma vez e reaproveitada pelos módulos que a leem
+            needs_page = check_security or check_cookies or check_sqli or check_content or check_authentication
+            response = fetch_url(url) if needs_page else None
+            html = response.text if response else None
+            if check_security:
+                if response:
+                    security_report = check_security_headers(response.headers, url)
+                    results["Security Headers"] = security_report
+
+            if check_cookies:
+                if response:
+                    results["Cookies"] = analyze_cookies(response.headers)
+
+            if check_directories:
+                st.write("Enumerating directories...")
+                if async_directories:
+                    from lib.async_directory_enumeration import async_directory_enumeration
+                    async_directory_enumeration(url)
+                else:
+                    from lib.directory_enumeration import directory_enumeration
+                    directory_enumeration(url, context=context)
+                results["Directories"] = "Directory enumeration completed."
+
+            if check_sqli:
+                st.write("Testing SQL Injection...")
+                from lib.injection_tests import test_sqli
+                test_sqli(url, context=context, html=html)
+                results["SQL Injection"] = "SQL Injection test completed."
+                if check_blind_sqli:
+                    st.write("Testing time-based blind SQL Injection...")
+                    from lib.blind_sqli import test_blind_sqli
+                    results["Blind SQL Injection"] = test_blind_sqli(url, context=context, html=html)
+
+            if check_content:
+                if response:
+                    st.write("Analyzing content...")
+                    from lib.content_analysis import analyze_content
+                    content_results = analyze_content(response.text)
+                    results["Content"] = content_results
+
+            if check_authentication:
+                st.write("Testing authentication...")
+                from lib.authentication_tests import test_authentication
+                test_authentication(url, context=context, html=html)
+                results["Authentication"] = "Authentication test completed."
+
+            if check_performance:
+                st.write("Testing performance...")
+                from lib.performance_tests import performance_test_menu
+                performance_test_menu(url)
+                results["Performance"] = "Performance test completed."
+
+            if check_subdomains:
+                st.write("Discovering subdomains...")
+                from lib.subdomain_discovery import run_subdomain_discovery
+                subdomain_results = run_subdomain_discovery(url)
+                results["Subdomains"] = subdomain_results
+
+        results["HTTP Connections"] = connection_stats()
 
         # Display results on the main screen
         results_placeholder.write("## Scan Results")
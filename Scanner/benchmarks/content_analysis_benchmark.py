@@ -0,0 +1,96 @@
+# scanner/benchmarks/content_analysis_benchmark.py
+#
+# Compara a análise de conteúdo antiga (seis buscas completas na árvore, uma por
+# categoria) com a passada única de analyze_tree, em páginas grandes, para cada
+# parser disponível. O tempo de parsing é medido à parte da análise.
+#
+# Uso: python benchmarks/content_analysis_benchmark.py [--iterations 3]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from lib.content_analysis import (DEFAULT_PARSER, analyze_comments, analyze_external_links, analyze_forms,  # noqa: E402
+                                  analyze_links, analyze_metadata, analyze_scripts, analyze_tree, empty_result,
+                                  fastest_parser)
+from lib.keyword_index import KeywordIndex  # noqa: E402
+
+KEYWORDS = ['password', 'token', 'api_key', 'secret', 'debug', 'admin', 'user', 'session']
+KEYWORD_INDEX = KeywordIndex(KEYWORDS)
+
+
+def legacy_analysis(soup, keywords):
+    result = empty_result()
+    analyze_comments(soup, result, keywords)
+    analyze_forms(soup, result)
+    analyze_scripts(soup, result)
+    analyze_links(soup, result)
+    analyze_external_links(soup, result)
+    analyze_metadata(soup, result)
+    return result
+
+
+def build_page(blocks):
+    parts = ['<html><head><title>Bench</title>',
+             '<meta name="description" content="bench"><meta charset="utf-8">',
+             '<script src="/static/app.js"></script></head><body>']
+    for index in range(blocks):
+        kind = random.randrange(6)
+        if kind == 0:
+            parts.append(f'<!-- build {index} {random.choice(KEYWORDS + ["todo", "fixme"])} -->')
+        elif kind == 1:
+            parts.append(f'<form method="post" action="/f{index}"><input type="text" name="user{index}">'
+                         f'<input type="hidden" name="csrf_token" value="x"><select name="s"></select>'
+                         f'<textarea name="t"></textarea></form>')
+        elif kind == 2:
+            parts.append(f'<script>var v{index} = {index};</script>')
+        elif kind == 3:
+            href = random.choice([f'/page{index}', f'http://ext{index}.example/', f'/admin/{index}', '#'])
+            parts.append(f'<a href="{href}">link {index}</a>')
+        elif kind == 4:
+            parts.append(f'<meta name="m{index}" content="{index}">')
+        else:
+            parts.append('<div><ul>' + ''.join(f'<li><span>item {index}.{i}</span></li>' for i in range(5))
+                         + '</ul></div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def measure(func, iterations):
+    best = float('inf')
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da análise de conteúdo")
+    parser.add_argument('--iterations', type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(1)
+    parsers = list(dict.fromkeys([DEFAULT_PARSER, fastest_parser()]))
+    print(f"{'blocos':>8} {'KB':>6} {'parser':>12} {'parsing (ms)':>13} {'6 buscas (ms)':>14} "
+          f"{'passada única (ms)':>19} {'ganho':>7}")
+    for blocks in (1_000, 5_000, 10_000):
+        html = build_page(blocks)
+        for name in parsers:
+            soup = BeautifulSoup(html, name)
+            assert legacy_analysis(soup, KEYWORD_INDEX) == analyze_tree(soup, KEYWORD_INDEX)
+            parsing = measure(lambda: BeautifulSoup(html, name), args.iterations)
+            legacy = measure(lambda: legacy_analysis(soup, KEYWORD_INDEX), args.iterations)
+            single = measure(lambda: analyze_tree(soup, KEYWORD_INDEX), args.iterations)
+            print(f"{blocks:>8} {len(html) // 1024:>6} {name:>12} {parsing * 1000:>13.1f} {legacy * 1000:>14.1f} "
+                  f"{single * 1000:>19.1f} {legacy / single:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# scanner/benchmarks/content_stream_benchmark.py
+#
+# Pico de memória (tracemalloc) e tempo da análise de conteúdo com árvore completa
+# (analyze_tree sobre BeautifulSoup) contra a análise em streaming de lib/content_stream.py,
+# em páginas com um bundle JavaScript inline de vários tamanhos. No modo streaming a
+# página é gerada em pedaços e nunca existe inteira na memória, como numa resposta HTTP.
+#
+# Uso: python benchmarks/content_stream_benchmark.py [--sizes 1 4 16]
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from lib.content_analysis import analyze_tree  # noqa: E402
+from lib.content_stream import CHUNK_SIZE, analyze_chunks  # noqa: E402
+from lib.keyword_index import KeywordIndex  # noqa: E402
+
+KEYWORD_INDEX = KeywordIndex(['password', 'token', 'api_key', 'secret'])
+PAGE_HEAD = ('<html><head><meta name="generator" content="bench"><title>SPA</title></head><body>'
+             '<!-- api_key placeholder --><form method="post" action="/login"><input type="text" name="user">'
+             '<input type="password" name="password"></form><a href="http://cdn.example/">cdn</a><script>')
+PAGE_TAIL = '</script><a href="/admin">admin</a></body></html>'
+BUNDLE_LINE = 'function f(a,b){return a<b?"x":"y"};var s="\\u00e9";\n'
+
+
+def page_chunks(size_mb):
+    # Gera a página em pedaços de CHUNK_SIZE bytes
+    yield PAGE_HEAD.encode('utf-8')
+    line = BUNDLE_LINE.encode('utf-8')
+    block = line * (CHUNK_SIZE // len(line))
+    for _ in range(size_mb * 1024 * 1024 // len(block)):
+        yield block
+    yield PAGE_TAIL.encode('utf-8')
+
+
+def tree_analysis(size_mb):
+    html = b''.join(page_chunks(size_mb)).decode('utf-8')
+    return analyze_tree(BeautifulSoup(html, 'html.parser'), KEYWORD_INDEX)
+
+
+def stream_analysis(size_mb):
+    return analyze_chunks(page_chunks(size_mb), 'utf-8', KEYWORD_INDEX)
+
+
+def measure(func, size_mb):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(size_mb)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da análise de conteúdo em streaming")
+    parser.add_argument('--sizes', type=int, nargs='*', default=[1, 4, 16], help="tamanhos do bundle inline (MB)")
+    args = parser.parse_args()
+
+    print(f"{'bundle (MB)':>11} {'árvore (s)':>11} {'pico árvore (MB)':>17} {'stream (s)':>11} {'pico stream (MB)':>17}")
+    for size_mb in args.sizes:
+        tree, tree_time, tree_peak = measure(tree_analysis, size_mb)
+        stream, stream_time, stream_peak = measure(stream_analysis, size_mb)
+        for category in ('forms', 'links', 'external_links', 'metadata'):
+            assert tree[category] == stream[category]
+        assert len(tree["scripts"][0]["content"]) == stream["scripts"][0]["length"]
+        print(f"{size_mb:>11} {tree_time:>11.2f} {tree_peak / 2 ** 20:>17.1f} "
+              f"{stream_time:>11.2f} {stream_peak / 2 ** 20:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# scanner/benchmarks/keyword_index_benchmark.py
+#
+# Compara a classificação antiga de comentários (uma busca de substring por palavra-chave,
+# `any(keyword in comment.lower() ...)`) com o autômato de lib/keyword_index.py, usando
+# uma lista sintética do tamanho da burp-parameter-names.txt e páginas com muitos comentários.
+#
+# Uso: python benchmarks/keyword_index_benchmark.py [--keywords 6500] [--iterations 3]
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.keyword_index import KeywordIndex, ahocorasick  # noqa: E402
+
+
+def build_keywords(count):
+    words = set()
+    while len(words) < count:
+        words.add(''.join(random.choice(string.ascii_lowercase + '_') for _ in range(random.randint(4, 14))))
+    return sorted(words)
+
+
+def build_comments(keywords, count, length):
+    comments = []
+    for index in range(count):
+        text = ''.join(random.choice(string.ascii_lowercase + ' ') for _ in range(length))
+        if index % 4 == 0:
+            position = random.randrange(length)
+            text = text[:position] + random.choice(keywords) + text[position:]
+        comments.append(text)
+    return comments
+
+
+def legacy_classify(comments, keywords):
+    return [any(keyword in comment.lower() for keyword in keywords) for comment in comments]
+
+
+def indexed_classify(comments, index):
+    return [bool(index.find(comment)) for comment in comments]
+
+
+def measure(func, iterations):
+    best = float('inf')
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do índice de palavras-chave sensíveis")
+    parser.add_argument('--keywords', type=int, default=6500)
+    parser.add_argument('--iterations', type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(1)
+    keywords = build_keywords(args.keywords)
+    start = time.perf_counter()
+    index = KeywordIndex(keywords)
+    build = time.perf_counter() - start
+    print(f"{len(keywords)} palavras-chave, autômato {'pyahocorasick' if ahocorasick else 'Python puro'} "
+          f"montado em {build * 1000:.1f} ms\n")
+    print(f"{'comentários':>12} {'tamanho':>8} {'antigo (ms)':>12} {'autômato (ms)':>14} {'ganho':>7}")
+    for count, length in ((100, 200), (1_000, 200), (1_000, 2_000)):
+        comments = build_comments(keywords, count, length)
+        assert legacy_classify(comments, keywords) == indexed_classify(comments, index)
+        legacy = measure(lambda: legacy_classify(comments, keywords), args.iterations)
+        indexed = measure(lambda: indexed_classify(comments, index), args.iterations)
+        print(f"{count:>12} {length:>8} {legacy * 1000:>12.1f} {indexed * 1000:>14.1f} {legacy / indexed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
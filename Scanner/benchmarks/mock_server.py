@@ -0,0 +1,183 @@
+# scanner/benchmarks/mock_server.py
+#
+# Servidor local que imita um alvo para medir o scanner sem tocar em sites reais:
+# latência configurável, soft-404, páginas de erro SQL, formulário de login,
+# corpos grandes e atraso em payloads de sleep (SQLi time-based).
+#
+# Uso: python benchmarks/mock_server.py [--port 8800] [--latency 5] [--soft404]
+#
+# Rotas:
+#   /                   índice com links, formulário de login e de busca
+#   /<caminho>          200 para os caminhos de --hits; 404 (ou soft-404) para os demais
+#   /search?q=          página de erro MySQL quando q contém aspas simples
+#   /item?id=           dorme N segundos quando id contém sleep(N)
+#   /login              GET: formulário; POST: sucesso apenas com --username/--password
+#                       (a página de falha cita "Account blocked?" na ajuda)
+#   /large              corpo de --large-kb KB
+#   /site/<n>           site sintético de --site-pages páginas (árvore com --site-fanout links por página)
+
+import argparse
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_HITS = ('admin', 'api', 'backup', 'css', 'images', 'js', 'uploads')
+
+INDEX_PAGE = """<html><head><title>Mock</title></head><body>
+<h1>Mock target</h1>
+{links}
+<form method="post" action="/login">
+<input type="text" name="username"><input type="password" name="password">
+<input type="hidden" name="csrf_token" value="mock-token"><input type="submit" name="go" value="Entrar">
+</form>
+<form action="/search"><input type="text" name="q"></form>
+</body></html>"""
+
+# A ajuda menciona "blocked" sem haver bloqueio: o scanner não pode tratar a falha comum como lockout
+LOGIN_FAILURE = ('<html><body><h1>Sign in</h1><p>Login failed for {user}. Please check your password.</p>'
+                 '<p><a href="/help">Account blocked? Get help</a></p></body></html>')
+LOGIN_SUCCESS = "<html><body><h1>Dashboard</h1><p>Welcome back. You have 3 new messages and 2 pending reports.</p></body></html>"
+SQL_ERROR_PAGE = "<html><body><b>Warning: mysql_fetch_array()</b>: You have an error in your SQL syntax; check the manual near '{value}'</body></html>"
+SITE_PAGE = ('<html><head><meta name="page" content="{page}"></head><body><h1>Page {page}</h1>{links}'
+             '<a href="/site/0">home</a><a href="/site/{parent}#top">up</a><a href="http://cdn.example/{page}">cdn</a>'
+             '<a href="/logout">logout</a><!-- page {page} --></body></html>')
+SOFT_404_PAGE = "<html><body><h1>Page not available</h1><p>The page {path} could not be located on this server.</p></body></html>"
+
+_sleep_pattern = re.compile(r'sleep\((\d+)\)', re.IGNORECASE)
+
+
+def make_handler(options):
+    hits = set(options.hits)
+    large_body = (b'<p>' + b'x' * 1017 + b'</p>') * options.large_kb  # blocos de 1 KB
+
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, como um servidor real
+        disable_nagle_algorithm = True  # cabeçalho e corpo saem em escritas separadas
+
+        def log_message(self, format, *args):
+            pass
+
+        def _delay(self):
+            if options.latency:
+                time.sleep(max(options.latency + random.uniform(-options.jitter, options.jitter), 0) / 1000)
+
+        def _send(self, status, body, content_type='text/html; charset=utf-8', send_body=True):
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def _form(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            return parse_qs(self.rfile.read(length).decode('utf-8', 'replace'), keep_blank_values=True)
+
+        def _route(self, query, send_body=True):
+            self._delay()
+            path = urlparse(self.path).path
+            name = path.strip('/')
+            first = lambda key: query.get(key, [''])[0]
+
+            if path == '/':
+                links = '\n'.join(f'<a href="/{hit}/">{hit}</a>' for hit in sorted(hits))
+                return self._send(200, INDEX_PAGE.format(links=links), send_body=send_body)
+            if path == '/search':
+                value = first('q')
+                if "'" in value:
+                    return self._send(500 if options.error_status else 200,
+                                      SQL_ERROR_PAGE.format(value=value), send_body=send_body)
+                return self._send(200, f"<html><body>Resultados para {value}</body></html>", send_body=send_body)
+            if path == '/item':
+                match = _sleep_pattern.search(first('id'))
+                if match:
+                    time.sleep(min(int(match.group(1)), options.max_sleep))
+                return self._send(200, "<html><body>Item</body></html>", send_body=send_body)
+            if path == '/login':
+                if self.command != 'POST':
+                    return self._send(200, INDEX_PAGE.format(links=''), send_body=send_body)
+                if first('username') == options.username and first('password') == options.password:
+                    return self._send(200, LOGIN_SUCCESS)
+                return self._send(200, LOGIN_FAILURE.format(user=first('username')))
+            if path.startswith('/site/') and name[5:].isdigit() and int(name[5:]) < options.site_pages:
+                page = int(name[5:])
+                children = range(page * options.site_fanout + 1,
+                                 min(page * options.site_fanout + options.site_fanout, options.site_pages - 1) + 1)
+                links = ''.join(f'<a href="/site/{child}">{child}</a>' for child in children)
+                return self._send(200, SITE_PAGE.format(page=page, parent=max(page - 1, 0) // options.site_fanout,
+                                                        links=links), send_body=send_body)
+            if path == '/large':
+                return self._send(200, large_body, send_body=send_body)
+            if name.split('/')[0] in hits:
+                return self._send(200, f"<html><body><h1>{name}</h1><a href=\"/{name}/index\">index</a></body></html>",
+                                  send_body=send_body)
+            if options.soft404:
+                return self._send(200, SOFT_404_PAGE.format(path=path), send_body=send_body)
+            return self._send(404, "Not Found", send_body=send_body)
+
+        def do_GET(self):
+            self._route(parse_qs(urlparse(self.path).query, keep_blank_values=True))
+
+        def do_HEAD(self):
+            self._route(parse_qs(urlparse(self.path).query, keep_blank_values=True), send_body=False)
+
+        def do_POST(self):
+            query = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+            query.update(self._form())
+            self._route(query)
+
+        def do_PUT(self):
+            self.do_POST()
+
+        def do_DELETE(self):
+            self._route({})
+
+    return MockHandler
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Servidor alvo local para benchmarks")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--latency', type=float, default=0, help="latência por requisição (ms)")
+    parser.add_argument('--jitter', type=float, default=0, help="variação da latência (± ms)")
+    parser.add_argument('--soft404', action='store_true', help="caminhos inexistentes respondem 200")
+    parser.add_argument('--error-status', action='store_true', help="páginas de erro SQL com status 500")
+    parser.add_argument('--large-kb', type=int, default=1024)
+    parser.add_argument('--max-sleep', type=int, default=10)
+    parser.add_argument('--site-pages', type=int, default=100_000, help="páginas do site sintético em /site/")
+    parser.add_argument('--site-fanout', type=int, default=5)
+    parser.add_argument('--hits', nargs='*', default=list(DEFAULT_HITS))
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='s3cret')
+    return parser
+
+
+def start_server(options, port=None):
+    # Sobe o servidor numa thread; devolve (servidor, url base)
+    server = ThreadingHTTPServer((options.host, options.port if port is None else port), make_handler(options))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{options.host}:{server.server_address[1]}"
+
+
+def main():
+    options = build_parser().parse_args()
+    server = ThreadingHTTPServer((options.host, options.port), make_handler(options))
+    server.daemon_threads = True
+    print(f"Servidor de teste em http://{options.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
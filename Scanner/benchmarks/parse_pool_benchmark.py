@@ -0,0 +1,109 @@
+# scanner/benchmarks/parse_pool_benchmark.py
+#
+# Extração de links de páginas HTML como na enumeração de diretórios: parsing dentro das
+# threads de rede (como antes) contra a etapa de parsing em processos (lib/parse_pool.py)
+# com 1, 2, 4... processos até o número de núcleos. Mostra páginas/s, quantos núcleos o
+# parsing ocupou (CPU / tempo de parede) e quanto tempo cada thread de rede fica presa
+# por página, que com o pool é só o envio do HTML.
+#
+# Uso: python benchmarks/parse_pool_benchmark.py [--pages 400] [--links 300] [--threads 16]
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.directory_enumeration import extract_subdirectories  # noqa: E402
+from lib.parse_pool import ParsePool, available_cores  # noqa: E402
+
+BASE_URL = "http://example.com/app/"
+
+
+def build_page(index, links):
+    items = ''.join(f'<li><a href="/app/section-{index}/item-{link}">Item {link}</a> <span>descrição do item {link}</span></li>'
+                    for link in range(links))
+    return f"<html><head><title>Página {index}</title></head><body><ul>{items}</ul></body></html>"
+
+
+def run_threads(pages, threads):
+    # Antes: cada thread de rede faz o parsing da página que acabou de baixar
+    blocked = []
+    lock = Lock()
+
+    def handle(html):
+        start = time.perf_counter()
+        paths = extract_subdirectories(html, BASE_URL)
+        with lock:
+            blocked.append(time.perf_counter() - start)
+        return len(paths)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        found = sum(executor.map(handle, pages))
+    elapsed = time.perf_counter() - start
+    return found, elapsed, time.process_time() - cpu_start, sum(blocked) / len(blocked)
+
+
+def run_pool(pages, threads, workers):
+    parser = ParsePool(workers)
+    parser.submit(extract_subdirectories, "<a href='/'>", BASE_URL).result()  # Sobe os processos fora da medição
+    parser.stats.update(tasks=0, cpu_time=0.0, first=None, last=None)
+    blocked = []
+    found = []
+    lock = Lock()
+    finished = Event()
+
+    def parsed(paths):
+        with lock:
+            found.append(len(paths))
+            if len(found) == len(pages):
+                finished.set()
+
+    def handle(html):
+        start = time.perf_counter()
+        parser.submit(extract_subdirectories, html, BASE_URL, callback=parsed)
+        with lock:
+            blocked.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(handle, pages))
+    finished.wait()
+    elapsed = time.perf_counter() - start
+    parser.close()
+    return sum(found), elapsed, parser.stats["cpu_time"], sum(blocked) / len(blocked)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da etapa de parsing em processos")
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--links', type=int, default=300)
+    parser.add_argument('--threads', type=int, default=16, help="Threads de rede que entregam as páginas")
+    args = parser.parse_args()
+
+    pages = [build_page(index, args.links) for index in range(args.pages)]
+    cores = available_cores()
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+
+    print(f"{args.pages} páginas de {sum(map(len, pages)) / len(pages) / 1024:.0f} KB, {cores} núcleo(s) disponíveis\n")
+    print(f"{'modo':<22} {'páginas/s':>10} {'CPU parsing (s)':>16} {'núcleos ocupados':>17} {'bloqueio/página (µs)':>21}")
+    expected, elapsed, cpu, blocked = run_threads(pages, args.threads)
+    print(f"{'threads de rede':<22} {args.pages / elapsed:>10.1f} {cpu:>16.2f} {cpu / elapsed:>17.2f} {blocked * 1e6:>21.0f}")
+    for workers in counts:
+        found, elapsed, cpu, blocked = run_pool(pages, args.threads, workers)
+        assert found == expected
+        print(f"{f'{workers} processo(s)':<22} {args.pages / elapsed:>10.1f} {cpu:>16.2f} {cpu / elapsed:>17.2f} "
+              f"{blocked * 1e6:>21.0f}")
+
+
+if __name__ == "__main__":
+    main()
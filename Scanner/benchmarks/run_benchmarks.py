@@ -0,0 +1,197 @@
+# scanner/benchmarks/run_benchmarks.py
+#
+# Roda os módulos do scanner contra o servidor local (mock_server.py) e registra,
+# por cenário: requisições/s, tempo de CPU e pico de RSS. Cada cenário roda num
+# processo novo, para que CPU e memória não se misturem entre testes. Os resultados
+# são acrescentados a um histórico JSON Lines e comparados com a execução anterior.
+#
+# Uso: python benchmarks/run_benchmarks.py [--scenarios directories sqli auth performance crawl]
+#                                          [--latency 2] [--soft404] [--history arquivo.jsonl]
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from itertools import islice
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SCANNER_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, SCANNER_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import mock_server  # noqa: E402
+
+SCENARIOS = ('directories', 'sqli', 'auth', 'performance', 'crawl')
+DEFAULT_HISTORY = os.path.join(BENCHMARK_DIR, 'results', 'history.jsonl')
+
+
+def run_directories(url, args):
+    from lib.directory_enumeration import directory_enumeration, load_common_paths
+    directory_enumeration(url, paths=list(islice(load_common_paths(), args.paths)))
+
+
+def run_sqli(url, args):
+    from lib.injection_tests import test_sqli
+    test_sqli(f"{url}/search?q=1")
+
+
+def run_auth(url, args):
+    from lib.authentication_tests import test_authentication
+    # A credencial válida fica no fim: o teste percorre a lista inteira antes de parar
+    credentials = [(f"user{index}", f"pass{index}") for index in range(args.credentials)]
+    valid = (mock_server.build_parser().get_default('username'), mock_server.build_parser().get_default('password'))
+    credentials.append(valid)
+    results = test_authentication(url, credentials=credentials) or []
+    # A ajuda da página de falha cita "blocked": tratá-la como bloqueio pularia a credencial válida
+    assert any((result.get('username'), result.get('password')) == valid for result in results), \
+        "credencial válida não encontrada"
+
+
+def run_performance(url, args):
+    from lib.performance_tests import load_test, stress_test
+    load_test(url, args.requests, 0)
+    stress_test(url, args.requests, args.threads, 0)
+
+
+def run_crawl(url, args):
+    from lib.crawler import Crawler
+    from lib.keyword_index import KeywordIndex
+    crawler = Crawler(f"{url}/site/0", max_depth=None, max_pages=args.pages, keyword_index=KeywordIndex(['page']))
+    for _ in crawler.crawl():
+        pass
+
+
+def run_scenario(name, url, args):
+    # Executado no processo filho: a saída do scanner é descartada e só a medição é impressa
+    from lib import http_client
+    runner = globals()[f"run_{name}"]
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        runner(url, args)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    requests = http_client.connection_stats()["requests"]
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    peak_rss_kb = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    print(json.dumps({
+        "requests": requests,
+        "elapsed": elapsed,
+        "req_per_sec": requests / elapsed if elapsed else 0,
+        "cpu_time": cpu,
+        "peak_rss_kb": peak_rss_kb,
+    }))
+
+
+def scenario_params(name, args):
+    # Parâmetros que definem a carga de cada cenário; só execuções iguais são comparadas
+    params = {"latency_ms": args.latency, "soft404": args.soft404}
+    if name == 'directories':
+        params["paths"] = args.paths
+    elif name == 'auth':
+        params["credentials"] = args.credentials
+    elif name == 'performance':
+        params.update(requests=args.requests, threads=args.threads)
+    elif name == 'crawl':
+        params["pages"] = args.pages
+    return params
+
+
+def spawn(name, url, args):
+    command = [sys.executable, os.path.abspath(__file__), '--run-scenario', name, '--url', url,
+               '--paths', str(args.paths), '--credentials', str(args.credentials),
+               '--requests', str(args.requests), '--threads', str(args.threads), '--pages', str(args.pages)]
+    completed = subprocess.run(command, cwd=SCANNER_DIR, stdout=subprocess.PIPE, text=True, check=True,
+                               stderr=None if args.verbose else subprocess.DEVNULL)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCANNER_DIR, text=True,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def previous_record(history, name, params):
+    for record in reversed(history):
+        if record["scenario"] == name and record["params"] == params:
+            return record
+    return None
+
+
+def delta(current, previous, key):
+    if not previous or not previous.get(key):
+        return ''
+    return f"({(current[key] - previous[key]) / previous[key] * 100:+.0f}%)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta contra o servidor local")
+    parser.add_argument('--scenarios', nargs='*', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--latency', type=float, default=2, help="latência simulada do servidor (ms)")
+    parser.add_argument('--soft404', action='store_true')
+    parser.add_argument('--paths', type=int, default=1000, help="caminhos de common.txt na enumeração")
+    parser.add_argument('--credentials', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=500, help="requisições dos testes de performance")
+    parser.add_argument('--threads', type=int, default=20)
+    parser.add_argument('--pages', type=int, default=5000, help="páginas rastreadas no site sintético")
+    parser.add_argument('--history', default=DEFAULT_HISTORY)
+    parser.add_argument('--verbose', action='store_true', help="mostra as barras de progresso dos cenários")
+    parser.add_argument('--run-scenario', choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        run_scenario(args.run_scenario, args.url, args)
+        return
+
+    server_args = ['--latency', str(args.latency), '--jitter', str(args.latency / 4)]
+    if args.soft404:
+        server_args.append('--soft404')
+    server, url = mock_server.start_server(mock_server.build_parser().parse_args(server_args), port=0)
+
+    history = load_history(args.history)
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+    run_info = {
+        "timestamp": datetime.datetime.now().isoformat(timespec='seconds'),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+    }
+
+    print(f"Servidor de teste em {url} (latência {args.latency} ms)\n")
+    print(f"{'cenário':<12} {'req':>7} {'tempo (s)':>10} {'req/s':>16} {'CPU (s)':>15} {'pico RSS (MB)':>20}")
+    try:
+        with open(args.history, 'a', encoding='utf-8') as history_file:
+            for name in args.scenarios:
+                params = scenario_params(name, args)
+                metrics = spawn(name, url, args)
+                previous = previous_record(history, name, params)
+                record = dict(run_info, scenario=name, params=params, **metrics)
+                history_file.write(json.dumps(record) + '\n')
+                history_file.flush()
+                print(f"{name:<12} {metrics['requests']:>7} {metrics['elapsed']:>10.2f} "
+                      f"{metrics['req_per_sec']:>8.1f} {delta(metrics, previous, 'req_per_sec'):>7} "
+                      f"{metrics['cpu_time']:>7.2f} {delta(metrics, previous, 'cpu_time'):>7} "
+                      f"{metrics['peak_rss_kb'] / 1024:>12.1f} {delta(metrics, previous, 'peak_rss_kb'):>7}")
+    finally:
+        server.shutdown()
+    print(f"\nHistórico: {args.history}")
+
+
+if __name__ == "__main__":
+    main()
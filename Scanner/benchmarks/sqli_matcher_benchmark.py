@@ -0,0 +1,65 @@
+# scanner/benchmarks/sqli_matcher_benchmark.py
+#
+# Compara a detecção antiga de erros SQL (response.text decodificado e lower() a cada
+# indicador) com o matcher compilado de lib/sql_errors.py, em páginas de vários tamanhos.
+#
+# Uso: python benchmarks/sqli_matcher_benchmark.py [--iterations 200]
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.sql_errors import ERROR_INDICATORS, find_sql_error  # noqa: E402
+
+LEGACY_INDICATORS = [indicator for indicators in ERROR_INDICATORS.values() for indicator in indicators]
+
+
+def legacy_check(content):
+    # response.text decodifica o corpo a cada acesso, como no check_sqli original
+    return any(error in content.decode('latin-1').lower() for error in LEGACY_INDICATORS)
+
+
+def build_page(size, with_error):
+    words = [''.join(random.choice(string.ascii_letters) for _ in range(random.randint(3, 10))) for _ in range(500)]
+    parts, length = [], 0
+    while length < size:
+        word = random.choice(words)
+        parts.append(f"<p>{word}</p>")
+        length += len(word) + 7
+    if with_error:
+        parts.insert(len(parts) * 3 // 4, "<b>Warning: MySQL server error</b>")
+    return ''.join(parts)
+
+
+def measure(func, payload, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(payload)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do detector de erros SQL")
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(1)
+    print(f"{'página':>12} {'erro':>5} {'antigo (ms)':>12} {'compilado (ms)':>15} {'ganho':>7}")
+    for size in (10_000, 100_000, 1_000_000):
+        for with_error in (False, True):
+            text = build_page(size, with_error)
+            content = text.encode('utf-8')
+            assert legacy_check(content) == bool(find_sql_error(content))
+            legacy = measure(legacy_check, content, args.iterations)
+            compiled = measure(find_sql_error, content, args.iterations)
+            print(f"{size:>12} {'sim' if with_error else 'não':>5} {legacy * 1000:>12.3f} "
+                  f"{compiled * 1000:>15.3f} {legacy / compiled:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# scanner/benchmarks/startup_benchmark.py
+#
+# Mede o tempo até o menu: um interpretador novo importa o ponto de entrada
+# (main.py por padrão) e exibe o logo e o menu, sem fazer requisições.
+#
+# Uso: python benchmarks/startup_benchmark.py [--runs 10] [--entry main]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCANNER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import builtins
+builtins.input = lambda prompt='': '10'
+import {entry}
+{entry}.display_logo()
+{entry}.menu()
+"""
+
+
+def time_to_menu(entry):
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', SNIPPET.format(entry=entry)],
+        cwd=SCANNER_DIR,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de tempo até o menu")
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--entry', default='main')
+    args = parser.parse_args()
+
+    time_to_menu(args.entry)  # Aquecimento (cache de bytecode e do sistema de arquivos)
+    times = [time_to_menu(args.entry) for _ in range(args.runs)]
+    print(f"Tempo até o menu ({args.entry}.py, {args.runs} execuções): "
+          f"mediana {statistics.median(times) * 1000:.1f} ms, "
+          f"mín {min(times) * 1000:.1f} ms, máx {max(times) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# scanner/benchmarks/url_frontier_benchmark.py
+#
+# Memória (tracemalloc) e tempo por URL da deduplicação com um set Python, como o
+# antigo visited_urls, contra o VisitedSet (filtro de Bloom + SQLite) e a UrlFrontier
+# com transbordo para o disco, para sites de centenas de milhares de URLs.
+#
+# Uso: python benchmarks/url_frontier_benchmark.py [--urls 100000 500000]
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.url_frontier import UrlFrontier, VisitedSet  # noqa: E402
+
+
+def site_urls(count):
+    # Cada URL aparece duas vezes, como links repetidos entre páginas
+    for index in range(count):
+        url = f"https://example.com/catalog/category-{index % 997}/item-{index}?ref=list&page={index % 50}"
+        yield url
+        yield url
+
+
+def run_set(count):
+    visited = set()
+    queue = []
+    for url in site_urls(count):
+        if url not in visited:
+            visited.add(url)
+            queue.append((url, 1))
+    return len(visited)
+
+
+def run_frontier(count):
+    frontier = UrlFrontier(VisitedSet(capacity=count))
+    for url in site_urls(count):
+        frontier.push(url, 1)
+    unique = len(frontier.visited)
+    false_positives = frontier.visited.stats["false_positives"]
+    while frontier.pop() is not None:
+        pass
+    frontier.close()
+    return unique, false_positives
+
+
+def measure(func, count):
+    # Tempo sem rastreamento (o tracemalloc deixa cada alocação bem mais lenta); memória numa segunda execução
+    start = time.perf_counter()
+    result = func(count)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(count)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da deduplicação de URLs do crawler")
+    parser.add_argument('--urls', type=int, nargs='*', default=[100_000, 500_000])
+    args = parser.parse_args()
+
+    print(f"{'URLs':>9} {'set (MB)':>9} {'set (µs/URL)':>13} {'fronteira (MB)':>15} {'fronteira (µs/URL)':>19} "
+          f"{'falsos positivos':>17}")
+    for count in args.urls:
+        unique, set_time, set_peak = measure(run_set, count)
+        (frontier_unique, false_positives), frontier_time, frontier_peak = measure(run_frontier, count)
+        assert unique == frontier_unique == count
+        print(f"{count:>9} {set_peak / 2 ** 20:>9.1f} {set_time / (2 * count) * 1e6:>13.2f} "
+              f"{frontier_peak / 2 ** 20:>15.1f} {frontier_time / (2 * count) * 1e6:>19.2f} {false_positives:>17}")
+
+
+if __name__ == "__main__":
+    main()
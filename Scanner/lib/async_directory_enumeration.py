@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urljoin
+
+import aiohttp
+from tqdm import tqdm
+
+from . import directory_enumeration as enumeration
+from .concurrency import controller_for
+from .fingerprint import Soft404Detector
+from .http_requests import get_random_user_agent
+from .parse_pool import ParsePool
+from .url_frontier import VisitedSet
+
+DEFAULT_CONCURRENCY = 500  # Sondas simultâneas em voo no mesmo event loop
+REQUEST_TIMEOUT = 5
+
+
+async def _resolve_base_url(session, url):
+    if url.startswith(('http://', 'https://')):
+        return url
+    # Mesmo comportamento do fetch_url: tenta HTTPS e cai para HTTP
+    try:
+        async with session.get('https://' + url) as response:
+            await response.read()
+            return 'https://' + url
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return 'http://' + url
+
+
+def _headers():
+    return {"User-Agent": get_random_user_agent()}
+
+
+@asynccontextmanager
+async def _request(session, method, url, state):
+    # Mesmo controle adaptativo por host usado pelo http_client no modo com threads
+    controller = controller_for(url)
+    await controller.acquire_async()
+    released = False
+    start = time.monotonic()
+    try:
+        async with session.request(method, url, headers=_headers()) as response:
+            controller.release(
+                latency=time.monotonic() - start,
+                status=response.status,
+                retry_after=response.headers.get('Retry-After'),
+                method=method,
+            )
+            released = True
+            state["stats"]["requests"] += 1
+            yield response
+    except asyncio.TimeoutError:
+        if not released:
+            controller.release(timed_out=True)
+        raise
+    except BaseException:
+        if not released:
+            controller.release()
+        raise
+
+
+async def _fetch(session, url, method, state):
+    # Devolve (status, url final, corpo, headers) apenas para respostas 200
+    stats = state["stats"]
+    try:
+        async with _request(session, method, url, state) as response:
+            if response.status != 200:
+                length = enumeration.content_length(response.headers)
+                if length > enumeration.drain_limit:
+                    stats["bytes_saved"] += length
+                else:
+                    stats["bytes_downloaded"] += len(await response.read())
+                return None
+            raw = await response.read()
+            stats["bytes_downloaded"] += len(raw)
+            return response.status, str(response.url), raw, response.headers
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+
+
+async def _find_existing(session, url, state):
+    # Mesma estratégia do modo com threads: HEAD primeiro, corpo apenas quando necessário
+    stats = state["stats"]
+    head_status = None
+    try:
+        async with _request(session, 'HEAD', url, state) as head:
+            head_status, head_headers = head.status, head.headers
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass
+
+    if head_status == 200:
+        if not await asyncio.to_thread(enumeration.needs_body, url, 200, head_headers, state["soft404"]):
+            stats["bytes_saved"] += enumeration.content_length(head_headers)
+            return 'HEAD', head_status, url, None, head_headers
+        found = await _fetch(session, url, 'GET', state)
+        return ('GET',) + found if found else None
+
+    if head_status is None or head_status in enumeration.head_fallback_status:
+        methods = [method for method in enumeration.http_methods if method != 'HEAD']
+    else:
+        methods = [method for method in enumeration.http_methods if method not in ('GET', 'HEAD')]
+        stats["bytes_saved"] += enumeration.content_length(head_headers)
+
+    for method in methods:
+        found = await _fetch(session, url, method, state)
+        if found:
+            return (method,) + found
+    return None
+
+
+async def _check_path(session, url, depth, state):
+    found = await _find_existing(session, url, state)
+    if found:
+        method, status, final_url, raw, headers = found
+        body = raw.decode('utf-8', errors='replace') if raw is not None else None
+        if method == 'HEAD' or not await asyncio.to_thread(state["soft404"].is_soft_404, url, status, body):
+            paths = set()
+            if method != 'HEAD' and 'text/html' in headers.get('Content-Type', ''):
+                # Parsing nos processos do ParsePool: o event loop segue atendendo as outras sondas
+                try:
+                    paths, _ = await asyncio.wrap_future(
+                        state["parser"].submit(enumeration.extract_subdirectories, body, final_url))
+                except Exception:
+                    paths = set()  # Falha no parsing: o achado vale, só sem recursão
+            state["results"].append((url, method, status))
+            state["records"][url] = {
+                "headers": dict(headers),
+                "body_length": enumeration.content_length(headers) if raw is None else len(raw),
+                "body_digest": None if raw is None else hashlib.sha256(raw).hexdigest(),
+                "subdirs": sorted(paths),
+            }
+            if depth < state["max_depth"]:
+                for path in paths:
+                    full_url = urljoin(final_url, path)
+                    if state["visited"].add(full_url):
+                        state["queue"].put_nowait((full_url, depth + 1))
+    state["progress_bar"].update(1)
+
+
+async def _worker(session, state):
+    queue = state["queue"]
+    while True:
+        url, depth = await queue.get()
+        try:
+            await _check_path(session, url, depth, state)
+        finally:
+            queue.task_done()
+
+
+async def _enumerate(url, common_paths, concurrency, max_depth):
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        base_url = await _resolve_base_url(session, url)
+        state = {
+            "max_depth": max_depth,
+            "soft404": Soft404Detector(),
+            "results": [],
+            "records": {},
+            # Mesma deduplicação com memória limitada do modo com threads (Bloom + SQLite)
+            "visited": VisitedSet(),
+            "parser": ParsePool(),
+            "queue": asyncio.Queue(),
+            "stats": enumeration.new_probe_stats(),
+            "progress_bar": tqdm(total=len(common_paths), desc="Buscando diretórios expostos (async)", unit="dir"),
+        }
+
+        workers = []
+        try:
+            for path in common_paths:
+                full_url = f"{base_url}/{path}"
+                if state["visited"].add(full_url):
+                    state["queue"].put_nowait((full_url, 0))
+
+            workers = [asyncio.create_task(_worker(session, state)) for _ in range(concurrency)]
+            await state["queue"].join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            state["progress_bar"].close()
+            state["visited"].close()
+            state["parser"].close()
+        return state["results"], state["records"], state["stats"], state["soft404"], state["parser"]
+
+
+def async_directory_enumeration(url, concurrency=DEFAULT_CONCURRENCY, max_depth=enumeration.max_depth):
+    common_paths = enumeration.load_common_paths()
+    start_time = time.time()
+    start_cpu = time.process_time()
+    results, records, stats, soft404, parser = asyncio.run(_enumerate(url, common_paths, concurrency, max_depth))
+    elapsed = time.time() - start_time
+    enumeration.report_results(results, records, stats, elapsed)
+    soft404.report()
+    parser.report(time.process_time() - start_cpu, elapsed)
+    return results
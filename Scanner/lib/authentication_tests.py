@@ -2,30 +2,49 @@ import requests
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import RequestException
 from tqdm import tqdm
-import os
-from threading import Thread, Lock
+from threading import Event, Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from bs4 import BeautifulSoup, Comment
-from urllib.parse import urljoin
+import re
+import secrets
+from itertools import islice
+import time
+from urllib.parse import urlparse
 from .http_requests import fetch_url
+from . import corpus
+from .checkpoint import Checkpoint
+from .concurrency import parse_retry_after
+from .fingerprint import matches_signature, response_record, response_signature
+from .form_templates import FormTemplate
+from .scan_context import ScanContext
+from .sql_errors import find_sql_error
+from .wordlists import Wordlist, parse_credential, seclist_path
 
-lock = Lock()
+credential_workers = 16     # Tentativas de login simultâneas por formulário
+LOCKOUT_STATUS = (429,)
+# Frases inteiras: "locked" solto casaria com "blocked", "unlocked" e textos de ajuda
+LOCKOUT_MARKERS = re.compile(r"\b(?:too many (?:login |failed )?(?:attempts|requests|tries)|account (?:is |has been )?locked"
+                             r"|temporarily (?:locked|blocked)|try again later)\b", re.IGNORECASE)
+LOCKOUT_BACKOFF = 1         # Pausa inicial (s) após um bloqueio; dobra a cada novo bloqueio
+LOCKOUT_BACKOFF_MAX = 60
+MAX_LOCKOUT_RETRIES = 5
+FAILURE_PROBES = 2          # Logins com credenciais aleatórias para a assinatura de falha
 
 def load_common_credentials():
-    credentials_path = os.path.join(os.path.dirname(__file__), 'SecList', 'Passwords', 'xato-net-10-million-passwords-dup.txt')
-    if not os.path.exists(credentials_path):
-        raise FileNotFoundError(f"O arquivo 'xato-net-10-million-passwords-dup.txt' não foi encontrado em: {credentials_path}")
-    with open(credentials_path, 'r', encoding='latin-1') as file:
-        return [line.strip().split(':') for line in file if ':' in line.strip()]
+    return Wordlist(seclist_path('Passwords', 'xato-net-10-million-passwords-dup.txt'), parse=parse_credential)
 
 def load_sqli_payloads():
-    payloads_path = os.path.join(os.path.dirname(__file__), 'SecList', 'Fuzzing', 'SQLi', 'quick-SQLi.txt')
-    if not os.path.exists(payloads_path):
-        raise FileNotFoundError(f"O arquivo 'quick-SQLi.txt' não foi encontrado em: {payloads_path}")
-    with open(payloads_path, 'r', encoding='latin-1') as file:
-        return [line.strip() for line in file if line.strip()]
+    return corpus.entries('sqli-quick')
 
-common_credentials = load_common_credentials()
-sqli_payloads = load_sqli_payloads()
+# As wordlists só são abertas no primeiro teste de autenticação, não no import do módulo
+@lru_cache(maxsize=None)
+def get_common_credentials():
+    return load_common_credentials()
+
+@lru_cache(maxsize=None)
+def get_sqli_payloads():
+    return load_sqli_payloads()
 
 def identify_login_forms(html):
     soup = BeautifulSoup(html, 'html.parser')
@@ -41,92 +60,263 @@ def identify_login_forms(html):
 
     return login_forms
 
-def test_login_form(url, form, progress_bar, results):
-    action = form.get('action') or url
-    action = urljoin(url, action)
-    method = form.get('method', 'post').lower()
+class CredentialRun:
+    # Estado compartilhado pelos workers de um formulário: fonte de credenciais,
+    # parada antecipada, pausa por bloqueio (backoff exponencial) e contadores.
+
+    def __init__(self, credentials, start=0):
+        # `start` pula as credenciais já testadas (retomada a partir do checkpoint)
+        if start:
+            credentials = credentials.slice(start) if hasattr(credentials, 'slice') else islice(credentials, start, None)
+        self._credentials = enumerate(credentials, start)
+        self._lock = Lock()
+        self._done = set()
+        self.watermark = start  # Todas as credenciais abaixo deste índice já foram testadas
+        self.stop = Event()
+        self.paused_until = 0.0
+        self.backoff = 0
+        self.last_lockout = 0.0
+        self.attempts = 0
+        self.lockouts = 0
+        self.skipped = 0
+        self.started = time.monotonic()
+
+    def next_credential(self):
+        with self._lock:
+            return next(self._credentials, None)
+
+    def complete(self, index):
+        # Os workers terminam fora de ordem; a marca só avança sobre um prefixo contínuo
+        with self._lock:
+            self._done.add(index)
+            while self.watermark in self._done:
+                self._done.remove(self.watermark)
+                self.watermark += 1
+            return self.watermark
+
+    def wait_if_paused(self):
+        while not self.stop.is_set():
+            pause = self.paused_until - time.monotonic()
+            if pause <= 0:
+                return
+            self.stop.wait(pause)
+
+    def register_lockout(self, retry_after=None):
+        now = time.monotonic()
+        with self._lock:
+            self.lockouts += 1
+            if now < self.paused_until:
+                return  # Bloqueios simultâneos de vários workers contam como um só
+            if now - self.last_lockout > LOCKOUT_BACKOFF_MAX:
+                self.backoff = 0  # Longo período sem bloqueios: recomeça do backoff inicial
+            self.last_lockout = now
+            self.backoff = min(max(self.backoff * 2, LOCKOUT_BACKOFF), LOCKOUT_BACKOFF_MAX)
+            pause = parse_retry_after(retry_after) or self.backoff
+            self.paused_until = now + pause
+
+    def register_attempt(self):
+        with self._lock:
+            self.attempts += 1
+
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.attempts / elapsed if elapsed else 0
+
+def is_lockout(response, baseline=None, values=()):
+    # Sinal principal: 429 ou Retry-After. O texto só conta quando a resposta foge da
+    # página de falha conhecida, que pode mencionar bloqueio sem bloquear ninguém
+    if response.status_code in LOCKOUT_STATUS or response.headers.get('Retry-After'):
+        return True
+    if baseline is None or baseline.is_failure(response, values):
+        return False
+    return LOCKOUT_MARKERS.search(response.text) is not None
+
+class FailureBaseline:
+    # Assinaturas (status, faixa de tamanho, simhash) das respostas a credenciais
+    # aleatórias, sabidamente inválidas. Uma tentativa é sucesso quando foge delas.
 
-    for username, password in common_credentials:
-        form_data = {input_tag.get('name'): (username if input_tag.get('type') == 'text' else password)
-                     for input_tag in form.findAll('input') if input_tag.get('name')}
+    def __init__(self, template, context, probes=FAILURE_PROBES):
+        self.signatures = {}
+        self.paths = set()
+        for _ in range(probes):
+            values = (secrets.token_hex(6), secrets.token_hex(8))
+            try:
+                response = context.request(template.method, template.action, data=template.fill(*values), cache=False)
+            except RequestException:
+                continue
+            if not is_lockout(response):
+                status, bucket, fingerprint = self.signature(response, values)
+                self.signatures.setdefault((status, bucket), []).append(fingerprint)
+                self.paths.add(urlparse(response.url).path)
+
+    @staticmethod
+    def signature(response, values):
+        # Usuário e senha ecoados na página não podem diferenciar duas falhas
+        text = response.text
+        for value in values:
+            if value:
+                text = text.replace(value, '')
+        return response_signature(response.url, response.status_code, text)
+
+    def is_failure(self, response, values):
+        if not self.signatures:
+            return "invalid" in response.text.lower()  # Sem linha de base: heurística antiga
+        return (urlparse(response.url).path in self.paths
+                and matches_signature(self.signatures, self.signature(response, values)))
+
+def is_login_success(response, baseline, values):
+    return not baseline.is_failure(response, values)
+
+def submit_login(method, action, form_data, run, context, baseline, values):
+    # Repete a tentativa enquanto o servidor sinaliza bloqueio, respeitando o backoff
+    for _ in range(MAX_LOCKOUT_RETRIES + 1):
+        run.wait_if_paused()
+        if run.stop.is_set():
+            return None
+        # Sem cache: cada tentativa, confirmação e nova tentativa após bloqueio chega ao servidor
+        response = context.request(method, action, data=form_data, cache=False)
+        if not is_lockout(response, baseline, values):
+            run.register_attempt()
+            return response
+        run.register_lockout(response.headers.get('Retry-After'))
+    return None
+
+def credential_worker(url, template, baseline, run, progress_bar, results, context, state=None):
+    while not run.stop.is_set():
+        item = run.next_credential()
+        if item is None:
+            return
+        index, credential = item
+        username, password = credential
+        form_data = template.fill(username, password)
 
         try:
-            response = requests.request(method, action, data=form_data)
-            if "invalid" not in response.text.lower():  # Simplistic check, adjust as needed
-                with lock:
-                    results.append({
-                        'url': url,
-                        'action': action,
-                        'username': username,
-                        'password': password,
-                        'response': response.text
-                    })
+            response = submit_login(template.method, template.action, form_data, run, context, baseline, credential)
+            if response is None and not run.stop.is_set():
+                with context.lock:
+                    run.skipped += 1  # Bloqueado em todas as tentativas: credencial não testada
+            # Sucesso só é aceito se uma segunda submissão idêntica também passar
+            if response is not None and is_login_success(response, baseline, credential):
+                confirmation = submit_login(template.method, template.action, form_data, run, context, baseline, credential)
+                if confirmation is not None and is_login_success(confirmation, baseline, credential):
+                    with context.lock:
+                        if not run.stop.is_set():
+                            run.stop.set()
+                            results.append({
+                                'url': url,
+                                'action': template.action,
+                                'username': username,
+                                'password': password,
+                                'evidence': response_record(response)
+                            })
         except requests.RequestException as e:
-            with lock:
+            with context.lock:
                 results.append({'url': url, 'error': str(e)})
 
-        with lock:
+        watermark = run.complete(index)
+        if state:
+            state.set_meta('watermark', watermark)
+        with context.lock:
             progress_bar.update(1)
 
-def test_sqli_form(url, form, progress_bar, results):
-    action = form.get('action') or url
-    action = urljoin(url, action)
-    method = form.get('method', 'post').lower()
+def test_login_form(url, template, progress_bar, results, context, workers=None, credentials=None, checkpoint=None):
+    baseline = FailureBaseline(template, context)
+    state = Checkpoint(checkpoint, f"auth:{template.action}") if checkpoint else None
+    start = state.get_meta('watermark', 0) if state else 0
+    if start:
+        print(f"\nRetomando {template.action} a partir da credencial {start}")
+        progress_bar.update(start)
+    run = CredentialRun(get_common_credentials() if credentials is None else credentials, start)
+    workers = context.workers(workers or credential_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(workers):
+                executor.submit(credential_worker, url, template, baseline, run, progress_bar, results, context, state)
+    finally:
+        if state:
+            state.flush()
+
+    elapsed = time.monotonic() - run.started
+    if state:
+        state.report(elapsed)
+        state.clear()
+        state.close()
+    outcome = " - credencial confirmada, teste interrompido" if run.stop.is_set() else ""
+    print(f"\n{template.action}: {run.attempts} tentativas em {elapsed:.2f}s ({run.rate():.1f} tentativas/s), "
+          f"{run.lockouts} bloqueios detectados, {run.skipped} credenciais não testadas{outcome}")
+    return run
 
-    for payload in sqli_payloads:
-        form_data = {input_tag.get('name'): (payload if input_tag.get('type') == 'text' else 'password')
-                     for input_tag in form.findAll('input') if input_tag.get('name')}
+def test_sqli_form(url, template, progress_bar, results, context):
+    for payload in get_sqli_payloads():
+        form_data = template.fill(payload, 'password')
 
         try:
-            response = requests.request(method, action, data=form_data)
-            if "syntax error" in response.text.lower():  # Simplistic check, adjust as needed
-                with lock:
+            response = context.request(template.method, template.action, data=form_data, cache=False)
+            sql_error = find_sql_error(response.content)
+            if sql_error:
+                with context.lock:
                     results.append({
                         'url': url,
-                        'action': action,
+                        'action': template.action,
                         'payload': payload,
-                        'response': response.text
+                        'dbms': sql_error[0],
+                        'evidence': response_record(response)
                     })
         except requests.RequestException as e:
-            with lock:
+            with context.lock:
                 results.append({'url': url, 'error': str(e)})
 
-        with lock:
+        with context.lock:
             progress_bar.update(1)
 
-def test_authentication(url):
-    response = fetch_url(url)
-    if not response:
-        print(f"Falha ao conectar a {url}")
-        return
+def test_authentication(url, credentials=None, checkpoint=None, context=None, html=None):
+    # `html`: página inicial já baixada pelo chamador, para não buscá-la de novo
+    # Sem contexto, o teste cria um só para si (e o fecha no fim)
+    owns_context = context is None
+    context = context or ScanContext(url)
+    try:
+        if html is None:
+            response = fetch_url(url, cache=True)
+            if not response:
+                print(f"Falha ao conectar a {url}")
+                return
+            html = response.text
 
-    html = response.text
-    login_forms = identify_login_forms(html)
+        login_forms = identify_login_forms(html)
 
-    if not login_forms:
-        print("Nenhum formulário de login encontrado.")
-        return
+        if not login_forms:
+            print("Nenhum formulário de login encontrado.")
+            return
 
-    results = []
-    threads = []
-    total_attempts = len(login_forms) * (len(common_credentials) + len(sqli_payloads))
-    progress_bar = tqdm(total=total_attempts, desc="Testando autenticação", unit="tentativa")
+        # Cada formulário é compilado uma vez; as tentativas só substituem valores
+        templates = [FormTemplate.from_form(form, url) for form in login_forms]
+        results = []
+        threads = []
+        if credentials is None:
+            credentials = get_common_credentials()
+        total_attempts = len(login_forms) * (len(credentials) + len(get_sqli_payloads()))
+        progress_bar = tqdm(total=total_attempts, desc="Testando autenticação", unit="tentativa")
 
-    for form in login_forms:
-        thread = Thread(target=test_login_form, args=(url, form, progress_bar, results))
-        threads.append(thread)
-        thread.start()
+        for template in templates:
+            thread = Thread(target=test_login_form, args=(url, template, progress_bar, results, context, None, credentials, checkpoint))
+            threads.append(thread)
+            thread.start()
 
-        thread = Thread(target=test_sqli_form, args=(url, form, progress_bar, results))
-        threads.append(thread)
-        thread.start()
+            thread = Thread(target=test_sqli_form, args=(url, template, progress_bar, results, context))
+            threads.append(thread)
+            thread.start()
 
-    for thread in threads:
-        thread.join()
+        for thread in threads:
+            thread.join()
 
-    progress_bar.close()
+        progress_bar.close()
 
-    print("\nResultados dos testes de autenticação:")
-    for result in results:
-        if 'error' not in result:
-            print(result)
+        print("\nResultados dos testes de autenticação:")
+        for result in results:
+            if 'error' not in result:
+                print(result)
+        context.set_results('authentication', results)
+        return results
+    finally:
+        if owns_context:
+            context.close()
@@ -0,0 +1,173 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.exceptions import RequestException, Timeout
+from tqdm import tqdm
+
+from . import corpus, http_client
+from .http_requests import get_random_user_agent
+from .injection_points import discover_injection_points, request_kwargs
+from .scan_context import ScanContext
+
+TIME_TOKEN = '__TIME__'
+DEFAULT_DELAY = 4          # Atraso (s) pedido pelos payloads de sleep/waitfor
+BASELINE_SAMPLES = 8       # Requisições benignas para a linha de base de latência
+CONFIRM_ROUNDS = 3         # Repetições isoladas de cada candidato
+SCREEN_WORKERS = 4         # Poucos payloads de atraso em paralelo, para não saturar o servidor
+CONTROL_EVERY = 4          # Uma requisição de controle a cada N payloads na triagem
+Z_THRESHOLD = 3.0          # Significância mínima (desvios-padrão acima da linha de base)
+MIN_DELAY_RATIO = 0.8      # O atraso observado precisa cobrir ao menos 80% do pedido
+BENIGN_VALUE = '1'
+
+
+def load_blind_payloads():
+    return [payload for payload in corpus.entries('sqli-blind') if TIME_TOKEN in payload]
+
+
+def timed_request(point, value, timeout, context):
+    # Latência de uma requisição com `value` no parâmetro testado; None se falhar.
+    # Sem cache e sem o controle adaptativo: a medição não pode incluir fila nem resposta guardada.
+    # O relógio só começa depois de obtida a vaga no orçamento do scan.
+    kwargs = request_kwargs(point, value)
+    with context.slot():
+        start = time.perf_counter()
+        try:
+            http_client.request(point["method"], point["url"], cache=False, adaptive=False, timeout=timeout,
+                                headers={"User-Agent": get_random_user_agent()}, **kwargs)
+        except Timeout:
+            return timeout
+        except RequestException:
+            return None
+        return time.perf_counter() - start
+
+
+def describe(samples):
+    samples = [sample for sample in samples if sample is not None]
+    return {
+        "samples": samples,
+        "mean": statistics.mean(samples) if samples else 0,
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0,
+    }
+
+
+def z_score(observed, baseline, count=1):
+    # Desvio mínimo de 10 ms: evita z infinito quando a linha de base é muito estável
+    spread = max(baseline["stdev"], 0.01) / (count ** 0.5)
+    return (observed - baseline["mean"]) / spread
+
+
+def is_significant(observed, baseline, delay, count=1):
+    return (observed - baseline["mean"] >= delay * MIN_DELAY_RATIO
+            and z_score(observed, baseline, count) >= Z_THRESHOLD)
+
+
+def screen(point, payloads, delay, baseline, progress_bar, context):
+    # Triagem concorrente. Requisições de controle intercaladas medem a latência sob a
+    # mesma carga; a linha de base efetiva é a pior entre a silenciosa e a de controle.
+    timeout = delay + baseline["mean"] * 4 + 5
+    tasks = []
+    for index, payload in enumerate(payloads):
+        tasks.append(payload)
+        if (index + 1) % CONTROL_EVERY == 0:
+            tasks.append(None)
+
+    def run(payload):
+        value = BENIGN_VALUE if payload is None else payload.replace(TIME_TOKEN, str(delay))
+        latency = timed_request(point, value, timeout, context)
+        with context.lock:
+            progress_bar.update(1)
+        return payload, latency
+
+    with ThreadPoolExecutor(max_workers=context.workers(SCREEN_WORKERS)) as executor:
+        outcomes = list(executor.map(run, tasks))
+
+    controls = describe([latency for payload, latency in outcomes if payload is None])
+    loaded = controls if controls["mean"] > baseline["mean"] else baseline
+    candidates = [(payload, latency) for payload, latency in outcomes
+                  if payload is not None and latency is not None and is_significant(latency, loaded, delay)]
+    return candidates, controls
+
+
+def confirm(point, payload, delay, baseline, context):
+    # Confirmação isolada (uma requisição por vez): o atraso deve aparecer em todas as
+    # rodadas e sumir quando o payload pede atraso zero
+    timeout = delay + baseline["mean"] * 4 + 5
+    delayed, zero = [], []
+    for _ in range(CONFIRM_ROUNDS):
+        delayed.append(timed_request(point, payload.replace(TIME_TOKEN, str(delay)), timeout, context))
+        zero.append(timed_request(point, payload.replace(TIME_TOKEN, '0'), timeout, context))
+    delayed_stats, zero_stats = describe(delayed), describe(zero)
+    confirmed = (
+        len(delayed_stats["samples"]) == CONFIRM_ROUNDS
+        and all(is_significant(sample, baseline, delay) for sample in delayed_stats["samples"])
+        and not is_significant(zero_stats["mean"], baseline, delay)
+    )
+    return confirmed, delayed_stats, zero_stats
+
+
+def test_point(point, payloads, delay, progress_bar, context):
+    baseline = describe(timed_request(point, BENIGN_VALUE, http_client.DEFAULT_TIMEOUT * 2, context)
+                        for _ in range(BASELINE_SAMPLES))
+    if not baseline["samples"]:
+        return []
+
+    candidates, controls = screen(point, payloads, delay, baseline, progress_bar, context)
+    findings = []
+    for payload, screening_latency in candidates:
+        confirmed, delayed_stats, zero_stats = confirm(point, payload, delay, baseline, context)
+        if confirmed:
+            findings.append({
+                "url": point["url"],
+                "method": point["method"],
+                "param": point["param"],
+                "payload": payload,
+                "delay": delay,
+                "evidence": {
+                    "baseline": baseline,
+                    "control_under_load": controls,
+                    "screening_latency": screening_latency,
+                    "delayed": delayed_stats,
+                    "zero_delay": zero_stats,
+                    "delta": delayed_stats["mean"] - baseline["mean"],
+                    "z_score": z_score(delayed_stats["mean"], baseline, len(delayed_stats["samples"])),
+                },
+            })
+    return findings
+
+
+def test_blind_sqli(url, delay=DEFAULT_DELAY, points=None, context=None, html=None):
+    # Uso restrito a alvos com autorização: os payloads fazem o banco aguardar `delay` segundos
+    if not url.startswith(('http://', 'https://')):
+        url = 'http://' + url
+    # Sem contexto, o teste cria um só para si (e o fecha no fim)
+    owns_context = context is None
+    context = context or ScanContext(url)
+    try:
+        payloads = load_blind_payloads()
+        points = points or discover_injection_points(url, html, context.request)
+        total = len(points) * (len(payloads) + len(payloads) // CONTROL_EVERY)
+        progress_bar = tqdm(total=total, desc="Testando SQLi time-based", unit="test")
+
+        findings = []
+        for point in points:
+            findings.extend(test_point(point, payloads, delay, progress_bar, context))
+        progress_bar.close()
+
+        if findings:
+            print("\nPossíveis vulnerabilidades de SQLi time-based encontradas:")
+            for finding in findings:
+                evidence = finding["evidence"]
+                print(f"URL: {finding['url']} - Método: {finding['method']} - Parâmetro: {finding['param']} - "
+                      f"Payload: {finding['payload']}")
+                print(f"  Linha de base: {evidence['baseline']['mean'] * 1000:.0f} ms "
+                      f"(desvio {evidence['baseline']['stdev'] * 1000:.0f} ms) - "
+                      f"Com atraso de {finding['delay']}s: {evidence['delayed']['mean'] * 1000:.0f} ms - "
+                      f"Atraso zero: {evidence['zero_delay']['mean'] * 1000:.0f} ms - z = {evidence['z_score']:.1f}")
+        else:
+            print("\nNenhuma vulnerabilidade de SQLi time-based encontrada.")
+        context.set_results('blind_sqli', findings)
+        return findings
+    finally:
+        if owns_context:
+            context.close()
@@ -0,0 +1,120 @@
+import json
+import sqlite3
+import time
+from threading import Lock
+
+FLUSH_EVERY = 200       # Registros acumulados antes de gravar em uma transação
+FLUSH_INTERVAL = 2.0    # ... ou segundos desde a última gravação, o que vier primeiro
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (scan TEXT, key TEXT, value TEXT, PRIMARY KEY (scan, key));
+CREATE TABLE IF NOT EXISTS frontier (scan TEXT, item TEXT, depth INTEGER, PRIMARY KEY (scan, item));
+CREATE TABLE IF NOT EXISTS completed (scan TEXT, item TEXT, PRIMARY KEY (scan, item));
+CREATE TABLE IF NOT EXISTS findings (scan TEXT, item TEXT, data TEXT, PRIMARY KEY (scan, item));
+"""
+
+
+class Checkpoint:
+    # Estado de um scan em SQLite: fronteira, itens concluídos, achados e metadados.
+    # As escritas ficam em buffer e são gravadas em lote (uma transação por flush),
+    # então o custo por item é o de um append em lista.
+
+    def __init__(self, path, scan, flush_every=FLUSH_EVERY, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.scan = scan
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = Lock()
+        self._frontier = []
+        self._completed = []
+        self._findings = []
+        self._meta = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self.stats = {"rows": 0, "flushes": 0, "flush_time": 0.0}
+
+    def load(self):
+        # Devolve (fronteira pendente [(item, profundidade)], itens concluídos, achados {item: dados})
+        rows = self._connection.execute
+        completed = {item for (item,) in rows("SELECT item FROM completed WHERE scan = ?", (self.scan,))}
+        frontier = [(item, depth) for item, depth in
+                    rows("SELECT item, depth FROM frontier WHERE scan = ? ORDER BY depth", (self.scan,))
+                    if item not in completed]
+        findings = {item: json.loads(data) for item, data in
+                    rows("SELECT item, data FROM findings WHERE scan = ?", (self.scan,))}
+        return frontier, completed, findings
+
+    def get_meta(self, key, default=None):
+        row = self._connection.execute("SELECT value FROM meta WHERE scan = ? AND key = ?", (self.scan, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _added(self):
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush()
+
+    def _buffer(self, target, row):
+        with self._lock:
+            target.append(row)
+            self._added()
+
+    def add_frontier(self, item, depth):
+        self._buffer(self._frontier, (self.scan, item, depth))
+
+    def mark_completed(self, item):
+        self._buffer(self._completed, (self.scan, item))
+
+    def add_finding(self, item, data):
+        self._buffer(self._findings, (self.scan, item, json.dumps(data)))
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._meta[key] = json.dumps(value)
+            self._added()
+
+    def _clear_buffers(self):
+        # Esvazia as listas no lugar: _buffer recebe a lista antes de tomar o lock
+        for buffer in (self._frontier, self._completed, self._findings, self._meta):
+            buffer.clear()
+        self._pending = 0
+
+    def _flush(self):
+        start = time.perf_counter()
+        with self._connection:
+            execute = self._connection.executemany
+            execute("INSERT OR IGNORE INTO frontier VALUES (?, ?, ?)", self._frontier)
+            execute("INSERT OR IGNORE INTO completed VALUES (?, ?)", self._completed)
+            execute("INSERT OR REPLACE INTO findings VALUES (?, ?, ?)", self._findings)
+            execute("INSERT OR REPLACE INTO meta VALUES (?, ?, ?)",
+                    [(self.scan, key, value) for key, value in self._meta.items()])
+        self.stats["rows"] += self._pending
+        self.stats["flushes"] += 1
+        self.stats["flush_time"] += time.perf_counter() - start
+        self._clear_buffers()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._pending:
+                self._flush()
+
+    def clear(self):
+        # Scan concluído: o próximo começa do zero
+        with self._lock:
+            self._clear_buffers()
+            with self._connection:
+                for table in ('meta', 'frontier', 'completed', 'findings'):
+                    self._connection.execute(f"DELETE FROM {table} WHERE scan = ?", (self.scan,))
+
+    def close(self):
+        self.flush()
+        self._connection.close()
+
+    def report(self, elapsed):
+        share = (self.stats["flush_time"] / elapsed) * 100 if elapsed else 0
+        print(f"Checkpoint ({self.path}): {self.stats['rows']} registros em {self.stats['flushes']} gravações, "
+              f"{self.stats['flush_time'] * 1000:.1f} ms ({share:.2f}% do tempo do scan)")
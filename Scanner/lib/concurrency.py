@@ -0,0 +1,186 @@
+import asyncio
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from threading import Condition, Lock
+from urllib.parse import urlparse
+
+INITIAL_LIMIT = 8          # Requisições simultâneas por host no início do scan
+MIN_LIMIT = 1
+MAX_LIMIT = 256
+DECREASE_FACTOR = 0.5      # Redução multiplicativa em timeouts, 429/503 ou latência degradada
+LATENCY_FACTOR = 3.0       # Latência média acima de N x a mínima recente indica sobrecarga
+BASELINE_WINDOW = 64       # Amostras recentes, por método, que formam a linha de base de latência
+EWMA_WEIGHT = 0.2
+MAX_RETRY_AFTER = 120      # Pausas pedidas pelo servidor são limitadas a 2 minutos
+OVERLOAD_STATUS = (429, 503)
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+
+class HostController:
+    # Controle AIMD do número de requisições em voo para um host: +1 por janela de
+    # respostas saudáveis, metade em sinais de sobrecarga, pausa quando há Retry-After.
+    # A latência de cada método (HEAD, GET...) é comparada só com a do mesmo método, e a
+    # linha de base é a mínima das últimas BASELINE_WINDOW respostas, não a de todo o scan.
+
+    def __init__(self, initial=INITIAL_LIMIT, minimum=MIN_LIMIT, maximum=MAX_LIMIT):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.latency = None
+        self._samples = {}         # Método -> latências recentes
+        self._method_latency = {}  # Método -> média móvel
+        self._last_decrease = 0.0
+        self._condition = Condition()
+        self._async_waiters = deque()  # (loop, future) das corrotinas esperando vaga
+        self.stats = {"requests": 0, "timeouts": 0, "overloaded": 0, "slowdowns": 0, "pauses": 0}
+
+    def try_acquire(self):
+        with self._condition:
+            return self._try_acquire()
+
+    def _try_acquire(self):
+        if self.in_flight < int(self.limit) and time.monotonic() >= self.paused_until:
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self):
+        with self._condition:
+            while not self._try_acquire():
+                pause = self.paused_until - time.monotonic()
+                self._condition.wait(pause if pause > 0 else None)
+
+    async def acquire_async(self):
+        # Sem espera ativa: a corrotina dorme num future que release() resolve quando abre vaga;
+        # só a pausa de Retry-After é esperada com sleep
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._try_acquire():
+                    return
+                pause = self.paused_until - time.monotonic()
+                if pause <= 0:
+                    waiter = loop.create_future()
+                    self._async_waiters.append((loop, waiter))
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._condition:
+                    if waiter.done() and not waiter.cancelled():
+                        self._wake_async(1)  # A vaga recebida passa para a próxima corrotina
+                    else:
+                        try:
+                            self._async_waiters.remove((loop, waiter))
+                        except ValueError:
+                            pass
+                raise
+
+    def _wake_async(self, count):
+        # Chamado com o lock: acorda até `count` corrotinas, na ordem de chegada
+        while count > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(self._resolve, waiter)
+            except RuntimeError:
+                continue  # Event loop já encerrado
+            count -= 1
+
+    def _resolve(self, waiter):
+        if waiter.done():
+            with self._condition:
+                self._wake_async(1)
+        else:
+            waiter.set_result(True)
+
+    def _decrease(self, now):
+        # Uma redução por "RTT": várias respostas ruins simultâneas contam como um único sinal
+        if now - self._last_decrease >= (self.latency or 0):
+            self.limit = max(self.minimum, self.limit * DECREASE_FACTOR)
+            self._last_decrease = now
+
+    def _slow(self, method, latency):
+        samples = self._samples.get(method)
+        if samples is None:
+            samples = self._samples[method] = deque(maxlen=BASELINE_WINDOW)
+        samples.append(latency)
+        average = self._method_latency.get(method)
+        average = latency if average is None else (1 - EWMA_WEIGHT) * average + EWMA_WEIGHT * latency
+        self._method_latency[method] = average
+        return average > min(samples) * LATENCY_FACTOR and average > 0.05
+
+    def release(self, latency=None, status=None, timed_out=False, retry_after=None, method=None):
+        now = time.monotonic()
+        with self._condition:
+            self.in_flight -= 1
+            self.stats["requests"] += 1
+            if timed_out:
+                self.stats["timeouts"] += 1
+                self._decrease(now)
+            elif status in OVERLOAD_STATUS:
+                self.stats["overloaded"] += 1
+                self._decrease(now)
+                pause = parse_retry_after(retry_after)
+                if pause:
+                    self.stats["pauses"] += 1
+                    self.paused_until = max(self.paused_until, now + pause)
+            elif latency is not None:
+                self.latency = latency if self.latency is None else (1 - EWMA_WEIGHT) * self.latency + EWMA_WEIGHT * latency
+                if self._slow(method, latency):
+                    self.stats["slowdowns"] += 1
+                    self._decrease(now)
+                elif self.in_flight + 1 >= int(self.limit):
+                    # Só cresce quando o limite estava de fato segurando requisições
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+            self._wake_async(int(self.limit) - self.in_flight)
+
+    def snapshot(self):
+        with self._condition:
+            return dict(
+                self.stats,
+                limit=int(self.limit),
+                in_flight=self.in_flight,
+                avg_latency=self.latency or 0,
+            )
+
+
+_controllers = {}
+_lock = Lock()
+
+
+def host_key(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def controller_for(url):
+    key = host_key(url)
+    controller = _controllers.get(key)
+    if controller is None:
+        with _lock:
+            controller = _controllers.setdefault(key, HostController())
+    return controller
+
+
+def controller_stats():
+    with _lock:
+        controllers = dict(_controllers)
+    return {host: controller.snapshot() for host, controller in controllers.items()}
@@ -1,8 +1,23 @@
-from bs4 import BeautifulSoup, Comment
+from bs4 import BeautifulSoup, Comment, Tag
 import re
-from tqdm import tqdm
 import json
 import os
+from functools import lru_cache
+from .keyword_index import KeywordIndex
+
+DEFAULT_PARSER = 'html.parser'
+FIELD_TAGS = ('input', 'textarea', 'select')
+SUSPICIOUS_LINK_KEYWORDS = ['login', 'admin', 'secure']
+_csrf_pattern = re.compile('csrf', re.IGNORECASE)
+
+def fastest_parser():
+    # lxml (C) quando instalado; html.parser (Python puro) como alternativa.
+    # Em HTML malformado o lxml pode montar uma árvore diferente da do html.parser.
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return DEFAULT_PARSER
 
 def load_sensitive_keywords():
     directory_of_this_script = os.path.dirname(__file__)
@@ -13,11 +28,13 @@ def load_sensitive_keywords():
         keywords = [line.strip() for line in file if line.strip()]
     return keywords
 
-def analyze_content(html):
-    soup = BeautifulSoup(html, 'html.parser')
-    sensitive_keywords = load_sensitive_keywords()
+# O arquivo é lido e o autômato montado uma única vez por processo
+@lru_cache(maxsize=None)
+def get_keyword_index():
+    return KeywordIndex(load_sensitive_keywords())
 
-    result = {
+def empty_result():
+    return {
         "comments": [],
         "forms": [],
         "scripts": [],
@@ -26,79 +43,119 @@ def analyze_content(html):
         "metadata": []
     }
 
-    tasks = [
-        ("Detecção de Comentários", lambda: analyze_comments(soup, result, sensitive_keywords)),
-        ("Identificação de Formulários", lambda: analyze_forms(soup, result)),
-        ("Busca por Scripts", lambda: analyze_scripts(soup, result)),
-        ("Busca por Links", lambda: analyze_links(soup, result)),
-        ("Verificação de Links Externos", lambda: analyze_external_links(soup, result)),
-        ("Detecção de Metadados", lambda: analyze_metadata(soup, result)),
-    ]
-
-    progress_bar = tqdm(total=len(tasks), desc="Analisando conteúdo", unit="task")
-    for task_name, task_func in tasks:
-        task_func()
-        progress_bar.update(1)
-    progress_bar.close()
-
+def analyze_content(html, parser=DEFAULT_PARSER, sensitive_keywords=None):
+    soup = BeautifulSoup(html, parser)
+    keyword_index = get_keyword_index() if sensitive_keywords is None else KeywordIndex(sensitive_keywords)
+    result = analyze_tree(soup, keyword_index)
     print(json.dumps(result, indent=4))
+    return result
+
+def analyze_tree(soup, keyword_index):
+    # Uma única passada pela árvore preenche as seis categorias, na mesma ordem
+    # em que as funções analyze_* abaixo (uma busca completa cada) as produzem.
+    result = empty_result()
+    forms = {}  # id(form) -> dados do formulário, para os campos encontrados depois
+
+    for node in soup.descendants:
+        if not isinstance(node, Tag):
+            if isinstance(node, Comment):
+                result["comments"].append(comment_data(node, keyword_index))
+            continue
+
+        name = node.name
+        if name == 'form':
+            data = form_data(node)
+            forms[id(node)] = data
+            result["forms"].append(data)
+        elif name in FIELD_TAGS:
+            if forms:
+                # O campo pertence a todos os formulários que o contêm (formulários aninhados)
+                for parent in node.parents:
+                    data = forms.get(id(parent))
+                    if data is not None and parent.name == 'form':
+                        add_field(data, node)
+        elif name == 'script':
+            result["scripts"].append(script_data(node))
+        elif name == 'a':
+            result["links"].append(link_data(node))
+            if node.get('href', '').startswith('http'):
+                result["external_links"].append(node.get('href'))
+        elif name == 'meta':
+            result["metadata"].append(meta_data(node))
+
+    return result
+
+def comment_data(comment, keyword_index):
+    keywords = keyword_index.find(comment)
+    return {
+        "text": comment,
+        "type": "sensitive" if keywords else "normal",
+        "keywords": keywords
+    }
+
+def form_data(form):
+    return {
+        "method": form.get('method', 'GET').upper(),
+        "action": form.get('action', 'N/A'),
+        "fields": [],
+        "csrf_token_found": False
+    }
+
+def add_field(data, input_tag):
+    data["fields"].append({
+        "type": input_tag.get('type', input_tag.name),
+        "name": input_tag.get('name', 'N/A')
+    })
+    if input_tag.name == 'input' and _csrf_pattern.search(input_tag.get('name') or ''):
+        data["csrf_token_found"] = True
+
+def script_data(script):
+    return {
+        "type": "external" if script.get('src') else "embedded",
+        "src": script.get('src'),
+        "content": script.string if script.string else "N/A"
+    }
+
+def link_data(link):
+    href = link.get('href', None)
+    return {
+        "type": "suspicious" if href and any(keyword in href.lower() for keyword in SUSPICIOUS_LINK_KEYWORDS) else "normal",
+        "href": href
+    }
+
+def meta_data(meta):
+    return {
+        "name": meta.get('name', 'N/A'),
+        "content": meta.get('content', 'N/A')
+    }
+
+# Análises por categoria (uma busca completa cada), para quem precisa de só uma delas
 
-def analyze_comments(soup, result, sensitive_keywords):
-    comments = soup.findAll(text=lambda text: isinstance(text, Comment))
+def analyze_comments(soup, result, keyword_index):
+    comments = soup.findAll(string=lambda text: isinstance(text, Comment))
     for comment in comments:
-        comment_data = {
-            "text": comment,
-            "type": "sensitive" if any(keyword in comment.lower() for keyword in sensitive_keywords) else "normal"
-        }
-        result["comments"].append(comment_data)
+        result["comments"].append(comment_data(comment, keyword_index))
 
 def analyze_forms(soup, result):
     forms = soup.findAll('form')
     for form in forms:
-        form_data = {
-            "method": form.get('method', 'GET').upper(),
-            "action": form.get('action', 'N/A'),
-            "fields": [],
-            "csrf_token_found": bool(form.findAll('input', {'name': re.compile('csrf', re.IGNORECASE)}))
-        }
-        inputs = form.findAll(['input', 'textarea', 'select'])
-        for input_tag in inputs:
-            field_data = {
-                "type": input_tag.get('type', input_tag.name),
-                "name": input_tag.get('name', 'N/A')
-            }
-            form_data["fields"].append(field_data)
-        result["forms"].append(form_data)
+        data = form_data(form)
+        for input_tag in form.findAll(FIELD_TAGS):
+            add_field(data, input_tag)
+        result["forms"].append(data)
 
 def analyze_scripts(soup, result):
-    scripts = soup.findAll('script')
-    for script in scripts:
-        script_data = {
-            "type": "external" if script.get('src') else "embedded",
-            "src": script.get('src'),
-            "content": script.string if script.string else "N/A"
-        }
-        result["scripts"].append(script_data)
+    for script in soup.findAll('script'):
+        result["scripts"].append(script_data(script))
 
 def analyze_links(soup, result):
-    links = soup.findAll('a')
-    for link in links:
-        href = link.get('href', None)
-        link_data = {
-            "type": "suspicious" if href and any(keyword in href.lower() for keyword in ['login', 'admin', 'secure']) else "normal",
-            "href": href
-        }
-        result["links"].append(link_data)
+    for link in soup.findAll('a'):
+        result["links"].append(link_data(link))
 
 def analyze_external_links(soup, result):
     external_links = [link.get('href') for link in soup.findAll('a') if link.get('href', '').startswith('http')]
     result["external_links"].extend(external_links)
 
 def analyze_metadata(soup, result):
-    metas = soup.findAll('meta')
-    for meta in metas:
-        meta_data = {
-            "name": meta.get('name', 'N/A'),
-            "content": meta.get('content', 'N/A')
-        }
-        result["metadata"].append(meta_data)
+    for meta in soup.findAll('meta'):
+        result["metadata"].append(meta_data(meta))
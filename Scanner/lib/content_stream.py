@@ -0,0 +1,230 @@
+import codecs
+import hashlib
+import json
+from html.parser import HTMLParser
+
+from requests.exceptions import RequestException
+
+from . import http_client
+from .content_analysis import (FIELD_TAGS, add_field, empty_result, form_data, get_keyword_index, link_data,
+                               meta_data)
+from .http_requests import resolve_scheme
+
+CHUNK_SIZE = 64 * 1024        # Bytes lidos da resposta por vez
+MAX_INLINE_CHARS = 2048       # Trecho guardado de scripts e comentários; o resto entra só no hash
+MAX_BUFFER = 256 * 1024       # Acima disso, conteúdo de <script>/<style> e comentários abertos sai do buffer
+CLOSE_TAG_WINDOW = 1024       # Final do buffer mantido para não cortar uma tag de fechamento ao meio
+
+
+class StartTag(dict):
+    # Atributos de uma tag de abertura com a mesma interface (.get/.name) usada pelos
+    # extratores de content_analysis para as tags do BeautifulSoup
+    __slots__ = ('name',)
+
+    def __init__(self, name, attrs):
+        super().__init__((key, '' if value is None else value) for key, value in attrs)
+        self.name = name
+
+
+class CappedText:
+    # Conteúdo recebido em pedaços: guarda só o início, o tamanho e o SHA-256 do todo.
+    # Com um índice de palavras-chave, cada pedaço é verificado com uma sobreposição
+    # do tamanho da maior palavra, para não perder ocorrências divididas entre pedaços.
+
+    def __init__(self, keyword_index=None):
+        self.head = []
+        self.head_length = 0
+        self.length = 0
+        self.digest = hashlib.sha256()
+        self.keyword_index = keyword_index
+        self.keywords = {}
+        self._overlap = ''
+
+    def update(self, text):
+        if not text:
+            return
+        self.length += len(text)
+        self.digest.update(text.encode('utf-8', 'surrogatepass'))
+        if self.head_length < MAX_INLINE_CHARS:
+            piece = text[:MAX_INLINE_CHARS - self.head_length]
+            self.head.append(piece)
+            self.head_length += len(piece)
+        if self.keyword_index is not None and self.keyword_index.max_length:
+            window = self._overlap + text
+            self.keywords.update(dict.fromkeys(self.keyword_index.find(window)))
+            self._overlap = window[-(self.keyword_index.max_length - 1):] if self.keyword_index.max_length > 1 else ''
+
+    @property
+    def text(self):
+        return ''.join(self.head)
+
+    @property
+    def truncated(self):
+        return self.length > self.head_length
+
+
+class StreamingAnalyzer(HTMLParser):
+    # Análise de conteúdo sobre o tokenizador incremental do html.parser: o corpo é
+    # consumido em pedaços e nenhuma árvore é montada, então a memória não cresce com a
+    # página. Produz as mesmas categorias de analyze_content; scripts e comentários longos
+    # são guardados truncados, com tamanho e hash do conteúdo completo.
+
+    def __init__(self, keyword_index):
+        super().__init__(convert_charrefs=True)
+        self.keyword_index = keyword_index
+        self.result = empty_result()
+        self._open_forms = []
+        self._script = None       # (registro, CappedText) do <script> aberto
+        self._comment = None      # CappedText de um comentário longo ainda aberto
+        self._comment_tail = ''
+
+    def feed(self, data):
+        if self._comment is not None:
+            data = self._continue_comment(data)
+            if not data:
+                return
+        super().feed(data)
+        self._bound_buffer()
+
+    def close(self):
+        if self._comment is not None:
+            self._comment.update(self._comment_tail)
+            self._finish_comment()
+        super().close()
+        self._finish_script()
+        return self.result
+
+    def _bound_buffer(self):
+        # O HTMLParser acumula o conteúdo de <script>/<style> até achar o fechamento e
+        # um comentário até achar '-->'; aqui esse conteúdo é repassado antes de crescer
+        rawdata = self.rawdata
+        if len(rawdata) <= MAX_BUFFER:
+            return
+        if self.cdata_elem:
+            cut = rawdata.rfind('<', len(rawdata) - CLOSE_TAG_WINDOW)
+            if cut <= 0:
+                cut = len(rawdata)
+            self.rawdata = rawdata[cut:]
+            self.handle_data(rawdata[:cut])
+        elif rawdata.startswith('<!--'):
+            self._comment = CappedText(self.keyword_index)
+            self._comment_tail = ''
+            self.rawdata = ''
+            rest = self._continue_comment(rawdata[4:])
+            if rest:
+                self.feed(rest)
+
+    def _continue_comment(self, data):
+        # Devolve o que vem depois do fim do comentário, ou None se ele continua aberto
+        text = self._comment_tail + data
+        end = text.find('-->')
+        if end < 0:
+            self._comment.update(text[:-2])
+            self._comment_tail = text[-2:]
+            return None
+        self._comment.update(text[:end])
+        self._finish_comment()
+        return text[end + 3:]
+
+    def _finish_comment(self):
+        comment = self._comment
+        self._comment = None
+        self._comment_tail = ''
+        keywords = list(comment.keywords)
+        self.result["comments"].append({
+            "text": comment.text,
+            "type": "sensitive" if keywords else "normal",
+            "keywords": keywords,
+            "truncated": True,
+            "length": comment.length,
+            "sha256": comment.digest.hexdigest()
+        })
+
+    def _finish_script(self):
+        if self._script is None:
+            return
+        record, content = self._script
+        self._script = None
+        record["content"] = content.text if content.length else "N/A"
+        record["truncated"] = content.truncated
+        record["length"] = content.length
+        record["sha256"] = content.digest.hexdigest() if content.length else None
+
+    def handle_starttag(self, name, attrs):
+        tag = StartTag(name, attrs)
+        if name == 'form':
+            data = form_data(tag)
+            self._open_forms.append(data)
+            self.result["forms"].append(data)
+        elif name in FIELD_TAGS:
+            for data in self._open_forms:
+                add_field(data, tag)
+        elif name == 'script':
+            self._finish_script()
+            record = {"type": "external" if tag.get('src') else "embedded", "src": tag.get('src')}
+            self.result["scripts"].append(record)
+            self._script = (record, CappedText())
+        elif name == 'a':
+            self.result["links"].append(link_data(tag))
+            if tag.get('href', '').startswith('http'):
+                self.result["external_links"].append(tag.get('href'))
+        elif name == 'meta':
+            self.result["metadata"].append(meta_data(tag))
+
+    def handle_startendtag(self, name, attrs):
+        self.handle_starttag(name, attrs)
+        if name == 'script':
+            self._finish_script()
+
+    def handle_endtag(self, name):
+        if name == 'form' and self._open_forms:
+            self._open_forms.pop()
+        elif name == 'script':
+            self._finish_script()
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script[1].update(data)
+
+    def handle_comment(self, data):
+        if len(data) <= MAX_INLINE_CHARS:
+            keywords = self.keyword_index.find(data)
+            self.result["comments"].append({
+                "text": data,
+                "type": "sensitive" if keywords else "normal",
+                "keywords": keywords
+            })
+            return
+        self._comment = CappedText(self.keyword_index)
+        self._comment.update(data)
+        self._finish_comment()
+
+
+def analyze_chunks(chunks, encoding='utf-8', keyword_index=None):
+    # `chunks` é qualquer iterável de bytes (ou str); o decodificador incremental
+    # trata caracteres multibyte divididos entre dois pedaços
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    analyzer = StreamingAnalyzer(get_keyword_index() if keyword_index is None else keyword_index)
+    for chunk in chunks:
+        analyzer.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+    analyzer.feed(decoder.decode(b'', final=True))
+    return analyzer.close()
+
+
+def analyze_url(url, chunk_size=CHUNK_SIZE):
+    # Aceita hosts sem esquema, como o restante do menu
+    url = resolve_scheme(url)
+    try:
+        response = http_client.request('GET', url, stream=True)
+        try:
+            result = analyze_chunks(response.iter_content(chunk_size), response.encoding or 'utf-8')
+        finally:
+            response.close()
+    except RequestException as e:
+        print(f"Erro ao analisar {url}: {e}")
+        return None
+    print(json.dumps(result, indent=4, ensure_ascii=False))
+    return result
@@ -0,0 +1,226 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from threading import Lock
+
+from .wordlists import seclist_path
+
+# Formato do corpus (little-endian):
+#   cabeçalho  | magic, versão, nº de entradas, nº de categorias, tamanho das listas, digest das fontes
+#   categorias | nome, início e tamanho da lista de entradas de cada categoria
+#   listas     | índices (u32) das entradas de cada categoria, na ordem original dos arquivos
+#   entradas   | offset, tamanho e máscara de categorias de cada entrada
+#   dados      | textos UTF-8, sem separadores
+MAGIC = b'WASCORP1'
+VERSION = 1
+HEADER = struct.Struct('<8sIIII16s')
+TAG = struct.Struct('<16sII')
+ENTRY = struct.Struct('<III')
+INDEX = struct.Struct('<I')
+
+CORPUS_PATH = seclist_path('payloads.corpus')
+
+# Categoria -> arquivo de origem. A ordem define o bit de cada categoria na máscara.
+SOURCES = {
+    'sqli-quick': ('Fuzzing', 'SQLi', 'quick-SQLi.txt'),
+    'sqli-generic': ('Fuzzing', 'SQLi', 'Generic-SQLi.txt'),
+    'sqli-blind': ('Fuzzing', 'SQLi', 'Generic-BlindSQLi.fuzzdb.txt'),
+    'paths': ('Discovery', 'Web-Content', 'common.txt'),
+}
+
+_lock = Lock()
+_corpus = None
+
+
+def sources_digest(sources=SOURCES):
+    # Muda quando qualquer arquivo de origem é alterado, adicionado ou removido
+    digest = hashlib.blake2b(digest_size=16)
+    for tag, parts in sources.items():
+        path = seclist_path(*parts)
+        stat = os.stat(path)
+        digest.update(f"{tag}\0{parts[-1]}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.digest()
+
+
+def normalize(line):
+    return line.strip()
+
+
+def read_source(path):
+    with open(path, 'r', encoding='latin-1') as file:
+        for line in file:
+            entry = normalize(line)
+            if entry:
+                yield entry
+
+
+def compile_corpus(sources=SOURCES):
+    # Junta as listas, remove duplicatas (mantendo a primeira ocorrência) e acumula as
+    # categorias de cada entrada numa máscara de bits
+    entries = {}
+    postings = {}
+    for bit, (tag, parts) in enumerate(sources.items()):
+        members = postings[tag] = []
+        seen = set()
+        for entry in read_source(seclist_path(*parts)):
+            index = entries.setdefault(entry, [len(entries), 0])
+            index[1] |= 1 << bit
+            if index[0] not in seen:
+                seen.add(index[0])
+                members.append(index[0])
+
+    blob = bytearray()
+    table = bytearray()
+    for entry in entries:
+        encoded = entry.encode('utf-8')
+        table += ENTRY.pack(len(blob), len(encoded), entries[entry][1])
+        blob += encoded
+
+    tags = bytearray()
+    lists = bytearray()
+    position = 0
+    for tag, members in postings.items():
+        tags += TAG.pack(tag.encode('ascii'), position, len(members))
+        lists += b''.join(INDEX.pack(member) for member in members)
+        position += len(members)
+
+    header = HEADER.pack(MAGIC, VERSION, len(entries), len(postings), position, sources_digest(sources))
+    return bytes(header + tags + lists + table + blob)
+
+
+def build_corpus(path=CORPUS_PATH, sources=SOURCES):
+    data = compile_corpus(sources)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(data)
+    os.replace(temporary, path)  # Troca atômica: leitores nunca veem um corpus pela metade
+    return path
+
+
+def is_stale(path=CORPUS_PATH, sources=SOURCES):
+    try:
+        with open(path, 'rb') as file:
+            header = file.read(HEADER.size)
+    except OSError:
+        return True
+    if len(header) < HEADER.size:
+        return True
+    magic, version, _, _, _, digest = HEADER.unpack(header)
+    return magic != MAGIC or version != VERSION or digest != sources_digest(sources)
+
+
+class CorpusView:
+    # Sequência somente leitura das entradas de uma categoria; decodifica sob demanda
+
+    def __init__(self, corpus, start, count):
+        self._corpus = corpus
+        self._start = start
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self._corpus.entry(self._corpus.index(self._start + position))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[position] for position in range(*key.indices(self._count))]
+        if key < 0:
+            key += self._count
+        if key < 0 or key >= self._count:
+            raise IndexError("índice fora do corpus")
+        return self._corpus.entry(self._corpus.index(self._start + key))
+
+    def slice(self, start=0, stop=None):
+        stop = self._count if stop is None else min(stop, self._count)
+        return (self[position] for position in range(start, stop))
+
+
+class Corpus:
+    # Corpus mapeado em memória: abrir custa a leitura do cabeçalho e da tabela de categorias
+
+    def __init__(self, data):
+        self._data = data
+        magic, version, self.count, tag_count, index_count, self.digest = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Formato de corpus desconhecido")
+        self.tags = {}
+        offset = HEADER.size
+        for bit in range(tag_count):
+            name, start, count = TAG.unpack_from(data, offset)
+            self.tags[name.rstrip(b'\0').decode('ascii')] = (bit, start, count)
+            offset += TAG.size
+        self._index_offset = offset
+        self._entry_offset = offset + index_count * INDEX.size
+        self._blob_offset = self._entry_offset + self.count * ENTRY.size
+
+    @classmethod
+    def open(cls, path=CORPUS_PATH):
+        with open(path, 'rb') as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def index(self, position):
+        return INDEX.unpack_from(self._data, self._index_offset + position * INDEX.size)[0]
+
+    def _entry(self, number):
+        return ENTRY.unpack_from(self._data, self._entry_offset + number * ENTRY.size)
+
+    def entry(self, number):
+        offset, length, _ = self._entry(number)
+        start = self._blob_offset + offset
+        return self._data[start:start + length].decode('utf-8')
+
+    def entry_tags(self, number):
+        mask = self._entry(number)[2]
+        return [tag for tag, (bit, _, _) in self.tags.items() if mask >> bit & 1]
+
+    def entries(self, tag):
+        if tag not in self.tags:
+            raise KeyError(f"Categoria '{tag}' não existe no corpus")
+        _, start, count = self.tags[tag]
+        return CorpusView(self, start, count)
+
+    def stats(self):
+        return {
+            "entries": self.count,
+            "bytes": len(self._data),
+            "tags": {tag: count for tag, (_, _, count) in self.tags.items()},
+        }
+
+
+def load_corpus(path=CORPUS_PATH):
+    # Reconstrói o corpus quando falta ou está desatualizado; sem permissão de escrita,
+    # usa a versão compilada em memória
+    global _corpus
+    if _corpus is not None:
+        return _corpus
+    with _lock:
+        if _corpus is None:
+            if is_stale(path):
+                try:
+                    build_corpus(path)
+                except OSError:
+                    _corpus = Corpus(compile_corpus())
+                    return _corpus
+            _corpus = Corpus.open(path)
+        return _corpus
+
+
+def entries(tag):
+    return load_corpus().entries(tag)
+
+
+if __name__ == '__main__':
+    # Passo de build: python -m lib.corpus [destino]
+    destination = build_corpus(sys.argv[1] if len(sys.argv) > 1 else CORPUS_PATH)
+    corpus = Corpus.open(destination)
+    stats = corpus.stats()
+    total = sum(stats["tags"].values())
+    print(f"Corpus gerado em {destination}: {stats['entries']} entradas únicas "
+          f"({total - stats['entries']} compartilhadas entre categorias), {stats['bytes']} bytes")
+    for tag, count in stats["tags"].items():
+        print(f"  {tag}: {count}")
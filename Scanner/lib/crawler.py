@@ -0,0 +1,263 @@
+import json
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlparse, urlunparse
+
+from requests.exceptions import RequestException
+from tqdm import tqdm
+
+from . import http_client
+from .content_analysis import get_keyword_index
+from .content_stream import CHUNK_SIZE, analyze_chunks
+from .http_requests import get_random_user_agent, resolve_scheme
+from .keyword_index import KeywordIndex
+from .parse_pool import ParsePool
+from .url_frontier import BLOOM_CAPACITY, UrlFrontier, VisitedSet
+
+crawler_workers = 16          # Páginas baixadas em paralelo (a análise roda nos processos de parsing)
+max_depth = 5                 # Cliques de distância a partir da página inicial
+max_pages = 10_000            # Limite padrão do menu; crawl() aceita None (sem limite)
+MAX_PAGE_BYTES = 5 * 1024 * 1024  # Corpo analisado por página; o resto é descartado
+DRAIN_LIMIT = 16 * 1024       # Corpos não-HTML até este tamanho são lidos para reaproveitar a conexão
+
+SKIPPED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp', '.bmp', '.css', '.js', '.map',
+                      '.pdf', '.zip', '.gz', '.tgz', '.rar', '.7z', '.tar', '.mp3', '.mp4', '.avi', '.mov', '.webm',
+                      '.woff', '.woff2', '.ttf', '.eot', '.exe', '.dmg', '.iso', '.apk')
+DEFAULT_EXCLUDE = (r'logout|log-out|signout|sign-out|sair',)  # Links que encerrariam a sessão
+
+
+def normalize_url(url):
+    # Forma canônica para a deduplicação: sem fragmento, esquema e host em minúsculas,
+    # sem porta padrão e com caminho vazio trocado por '/'
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if (scheme, port) in (('http', 80), ('https', 443)):
+        netloc = netloc.rsplit(':', 1)[0]
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, parsed.query, ''))
+
+
+class Scope:
+    # Regras de escopo do rastreamento: apenas http(s), o host inicial (e, opcionalmente,
+    # seus subdomínios), sem arquivos estáticos e sem URLs que casem com `exclude`.
+
+    def __init__(self, start_url, include_subdomains=False, exclude=DEFAULT_EXCLUDE):
+        self.host = (urlparse(start_url).hostname or '').lower()
+        self.include_subdomains = include_subdomains
+        self.exclude = [re.compile(pattern, re.IGNORECASE) for pattern in exclude]
+
+    def allows(self, url):
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return False
+        host = parsed.hostname or ''
+        if host != self.host and not (self.include_subdomains and host.endswith('.' + self.host)):
+            return False
+        if parsed.path.lower().endswith(SKIPPED_EXTENSIONS):
+            return False
+        return not any(pattern.search(url) for pattern in self.exclude)
+
+
+def limited_chunks(response, page):
+    received = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        received += len(chunk)
+        if received > MAX_PAGE_BYTES:
+            page["truncated"] = True
+            return
+        yield chunk
+
+
+def fetch_page(url, depth):
+    # Executado nas threads de rede: só baixa a página; o HTML segue em "body" para a etapa de parsing
+    page = {"url": url, "depth": depth}
+    try:
+        response = http_client.request('GET', url, stream=True, headers={"User-Agent": get_random_user_agent()})
+    except RequestException as e:
+        page["error"] = str(e)
+        return page
+    try:
+        content_type = response.headers.get('Content-Type', '')
+        page.update(final_url=response.url, status=response.status_code, content_type=content_type, analysis=None)
+        if 'html' in content_type:
+            page["body"] = list(limited_chunks(response, page))
+            page["encoding"] = response.encoding or 'utf-8'
+        elif int(response.headers.get('Content-Length') or DRAIN_LIMIT + 1) <= DRAIN_LIMIT:
+            response.content
+    except (RequestException, ValueError) as e:
+        page["error"] = str(e)
+    finally:
+        response.close()
+    return page
+
+
+# Índice de palavras-chave de cada processo de parsing, recebido uma única vez na inicialização
+_keyword_index = None
+
+
+def init_parser(keyword_index):
+    global _keyword_index
+    _keyword_index = keyword_index
+
+
+def parse_page(chunks, encoding):
+    # Executado nos processos de parsing: a mesma análise em stream, pedaço a pedaço
+    return analyze_chunks(chunks, encoding, _keyword_index)
+
+
+def page_links(page):
+    if not page.get("analysis"):
+        return []
+    base_url = page.get("final_url") or page["url"]
+    links = []
+    for link in page["analysis"]["links"]:
+        href = link["href"]
+        if not href or href.startswith(('#', 'mailto:', 'javascript:', 'tel:', 'data:')):
+            continue
+        links.append(normalize_url(urljoin(base_url, href)))
+    return links
+
+
+class Crawler:
+    # Rastreamento em largura: a thread que itera crawl() é a única que mexe na fronteira
+    # (sem locks); as threads de rede só baixam páginas e os processos de parsing só as
+    # analisam. Cada página é entregue assim que termina, e nada é acumulado, então a
+    # memória depende do número de workers e do tamanho do filtro de Bloom, não do site.
+
+    def __init__(self, start_url, max_depth=max_depth, max_pages=max_pages, workers=crawler_workers,
+                 scope=None, keyword_index=None, capacity=BLOOM_CAPACITY, parse_workers=None):
+        self.start_url = normalize_url(resolve_scheme(start_url))
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.workers = workers
+        self.scope = scope or Scope(self.start_url)
+        self.keyword_index = keyword_index if keyword_index is not None else load_keyword_index()
+        self.capacity = capacity
+        self.parser = ParsePool(parse_workers, initializer=init_parser, initargs=(self.keyword_index,))
+        self.stats = {"pages": 0, "errors": 0, "links": 0, "queued": 0, "out_of_scope": 0}
+
+    def crawl(self):
+        frontier = UrlFrontier(VisitedSet(self.capacity))
+        frontier.push(self.start_url, 0)
+        in_flight = {}  # Downloads nas threads de rede
+        parsing = {}    # Páginas nos processos de parsing
+        started = 0
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while True:
+                # Com o parsing atrasado, novos downloads esperam: no máximo `workers` corpos em fila
+                while (len(in_flight) < self.workers and len(parsing) < self.workers
+                       and (self.max_pages is None or started < self.max_pages)):
+                    item = frontier.pop()
+                    if item is None:
+                        break
+                    in_flight[executor.submit(fetch_page, *item)] = item
+                    started += 1
+                if not in_flight and not parsing:
+                    break
+                done, _ = wait([*in_flight, *parsing], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in in_flight:
+                        in_flight.pop(future)
+                        page = future.result()
+                        if "body" in page:
+                            parsing[self.parser.submit(parse_page, page.pop("body"), page.pop("encoding"))] = page
+                            continue
+                    else:
+                        page = parsing.pop(future)
+                        try:
+                            page["analysis"] = future.result()[0]
+                        except Exception as e:
+                            page["error"] = f"Falha no parsing: {e}"
+                    self._expand(frontier, page)
+                    yield page
+        finally:
+            for future in [*in_flight, *parsing]:
+                future.cancel()
+            executor.shutdown(wait=True)
+            self.parser.close()
+            self.stats["visited"] = len(frontier.visited)
+            self.stats["pending"] = len(frontier)
+            self.stats["dedup"] = dict(frontier.visited.stats, bloom_bytes=frontier.visited.memory)
+            frontier.close()
+
+    def _expand(self, frontier, page):
+        self.stats["pages"] += 1
+        if "error" in page:
+            self.stats["errors"] += 1
+            return
+        final_url = normalize_url(page["final_url"])
+        if final_url != page["url"]:
+            frontier.visited.add(final_url)  # Redirecionamento: o destino não é visitado de novo
+            if not self.scope.allows(final_url):
+                return
+        links = page_links(page)
+        queued = 0
+        if self.max_depth is None or page["depth"] < self.max_depth:
+            for link in links:
+                if not self.scope.allows(link):
+                    self.stats["out_of_scope"] += 1
+                elif frontier.push(link, page["depth"] + 1):
+                    queued += 1
+        page["links_found"] = len(links)
+        page["links_queued"] = queued
+        self.stats["links"] += len(links)
+        self.stats["queued"] += queued
+
+
+def load_keyword_index():
+    try:
+        return get_keyword_index()
+    except FileNotFoundError as e:
+        print(f"{e} Comentários não serão classificados por palavras-chave.")
+        return KeywordIndex([])
+
+
+def crawl_site(url, max_depth=max_depth, max_pages=max_pages, output=None, include_subdomains=False):
+    # Rastreia o site e grava a análise de cada página em JSON Lines (`output`) à medida que termina
+    crawler = Crawler(url, max_depth=max_depth, max_pages=max_pages,
+                      scope=Scope(resolve_scheme(url), include_subdomains=include_subdomains))
+    summary = {"forms": 0, "sensitive_comments": 0, "external_links": 0}
+    start_time = time.time()
+    start_cpu = time.process_time()
+    output_file = open(output, 'a', encoding='utf-8') if output else None
+    progress_bar = tqdm(total=max_pages, desc="Rastreando páginas", unit="página")
+    try:
+        for page in crawler.crawl():
+            progress_bar.update(1)
+            analysis = page.get("analysis")
+            if analysis:
+                summary["forms"] += len(analysis["forms"])
+                summary["sensitive_comments"] += sum(1 for comment in analysis["comments"] if comment["type"] == "sensitive")
+                summary["external_links"] += len(analysis["external_links"])
+                if analysis["forms"]:
+                    progress_bar.write(f"{page['url']}: {len(analysis['forms'])} formulário(s)")
+            if output_file:
+                output_file.write(json.dumps(page) + '\n')
+    finally:
+        progress_bar.close()
+        if output_file:
+            output_file.close()
+
+    elapsed = time.time() - start_time
+    network_cpu = time.process_time() - start_cpu
+    stats = crawler.stats
+    rate = stats["pages"] / elapsed if elapsed else 0
+    print(f"\n{stats['pages']} páginas em {elapsed:.2f}s ({rate:.1f} páginas/s), {stats['errors']} erros, "
+          f"{stats['pending']} URLs ainda na fronteira")
+    print(f"Links: {stats['links']} encontrados, {stats['queued']} novos na fronteira, "
+          f"{stats['out_of_scope']} fora do escopo - {stats['visited']} URLs únicas vistas")
+    dedup = stats["dedup"]
+    print(f"Deduplicação: filtro de Bloom de {dedup['bloom_bytes'] / 1024:.0f} KB, "
+          f"{dedup['disk_lookups']} consultas ao disco ({dedup['false_positives']} falsos positivos)")
+    print(f"Conteúdo: {summary['forms']} formulários, {summary['sensitive_comments']} comentários sensíveis, "
+          f"{summary['external_links']} links externos")
+    crawler.parser.report(network_cpu, elapsed)
+    if output:
+        print(f"Análise por página gravada em {output}")
+    return stats
@@ -1,96 +1,238 @@
-from .http_requests import fetch_url
-from threading import Thread, Lock, Semaphore
-import os
+from .http_requests import get_random_user_agent, resolve_scheme
+from .scheduler import WorkScheduler
+from .checkpoint import Checkpoint
+from . import corpus
+from .scan_context import ScanContext
+from requests.exceptions import RequestException
 from tqdm import tqdm
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-import random
+import hashlib
 import time
 
-lock = Lock()
-visited_urls = set()
-max_threads = 60  # Número máximo de threads simultâneas
-semaphore = Semaphore(max_threads)
-custom_404_text = ""
+max_threads = 60  # Número de workers do pool de enumeração
+max_depth = 3  # Profundidade máxima de recursão em subdiretórios
+drain_limit = 16 * 1024  # Corpos de erro até este tamanho são lidos para manter a conexão reutilizável
 
 http_methods = ['GET', 'POST', 'PUT', 'DELETE', 'HEAD']
+head_fallback_status = (405, 501)  # HEAD não suportado: volta para o GET
 
 def load_common_paths():
-    directory_of_this_script = os.path.dirname(__file__)
-    path_to_common_paths = os.path.join(directory_of_this_script, 'SecList', 'Discovery', 'Web-Content', 'common.txt')
-    if not os.path.exists(path_to_common_paths):
-        raise FileNotFoundError(f"O arquivo 'common.txt' não foi encontrado em: {path_to_common_paths}")
-    with open(path_to_common_paths, 'r', encoding='latin-1') as file:  # Usando encoding para suportar caracteres especiais
-        return [line.strip() for line in file if line.strip()]
-
-def detect_custom_404(url):
-    response = fetch_url(url + "/nonexistentpath", method='GET')
-    global custom_404_text
-    if response and response.status_code == 404:
-        custom_404_text = response.text
-
-def is_custom_404(response):
-    return custom_404_text and custom_404_text in response.text
-
-def check_path(url, results, progress_bar, methods):
-    global threads  # Adiciona essa linha para definir threads como global
+    return corpus.entries('paths')
+
+def new_probe_stats():
+    return {"requests": 0, "bytes_downloaded": 0, "bytes_saved": 0}
+
+def content_length(headers):
+    try:
+        return int(headers.get('Content-Length', 0))
+    except ValueError:
+        return 0
+
+def needs_body(url, status, headers, soft404):
+    # O corpo só é necessário para extrair links (HTML) ou quando o diretório tem
+    # soft-404 com o mesmo status e a classificação depende do conteúdo
+    return 'text/html' in headers.get('Content-Type', '') or soft404.needs_body(url, status)
+
+def add_stat(context, key, value):
+    stats = context.module_stats('directories', new_probe_stats)
+    with context.lock:
+        stats[key] += value
+
+def probe(url, method, context, stream=False):
+    try:
+        response = context.request(method, url, cache=False, headers={"User-Agent": get_random_user_agent()}, stream=stream)
+    except RequestException:
+        return None
+    add_stat(context, "requests", 1)
+    return response
+
+def read_body(response, context):
+    add_stat(context, "bytes_downloaded", len(response.content))
+
+def skip_body(response, context):
+    length = content_length(response.headers)
+    if length > drain_limit:
+        response.close()
+        add_stat(context, "bytes_saved", length)
+    else:
+        read_body(response, context)
+
+def find_existing(url, context):
+    # HEAD primeiro; GET/POST/PUT/DELETE apenas quando o HEAD não basta
+    head = probe(url, 'HEAD', context)
+    if head is not None and head.status_code == 200:
+        if not needs_body(url, 200, head.headers, context.soft404):
+            add_stat(context, "bytes_saved", content_length(head.headers))
+            return 'HEAD', head
+        response = probe(url, 'GET', context)
+        if response is not None:
+            read_body(response, context)
+            if response.status_code == 200:
+                return 'GET', response
+        return None
+
+    if head is None or head.status_code in head_fallback_status:
+        methods = [method for method in http_methods if method != 'HEAD']
+    else:
+        # O HEAD já respondeu pelo GET: o corpo do GET não precisa ser baixado
+        methods = [method for method in http_methods if method not in ('GET', 'HEAD')]
+        add_stat(context, "bytes_saved", content_length(head.headers))
+
     for method in methods:
-        response = fetch_url(url, method=method)
-        if response and response.status_code == 200 and not is_custom_404(response):
-            with lock:
-                results.append((url, method, response.status_code))
-                # Extrair subdiretórios encontrados para escaneamento adicional
-                if 'text/html' in response.headers.get('Content-Type', ''):
-                    subdirs = extract_subdirectories(response.text, url)
-                    for subdir in subdirs:
-                        full_url = urljoin(url, subdir)
-                        if full_url not in visited_urls:
-                            visited_urls.add(full_url)
-                            time.sleep(random.uniform(0.01, 0.1))  # Atraso aleatório entre 100ms e 1s
-                            thread = Thread(target=check_path, args=(full_url, results, progress_bar, methods))
-                            semaphore.acquire()
-                            thread.start()
-                            threads.append(thread)
-                break
-    with lock:
+        response = probe(url, method, context, stream=True)
+        if response is None:
+            continue
+        if response.status_code == 200:
+            read_body(response, context)
+            return method, response
+        skip_body(response, context)
+    return None
+
+def build_record(method, response, subdirs):
+    # Registro compacto de um acerto: o relatório detalhado é montado a partir dele, sem novas requisições
+    body = b'' if method == 'HEAD' else response.content
+    return {
+        "method": method,
+        "status": response.status_code,
+        "headers": dict(response.headers),
+        "body_length": content_length(response.headers) if method == 'HEAD' else len(body),
+        "body_digest": None if method == 'HEAD' else hashlib.sha256(body).hexdigest(),
+        "subdirs": sorted(subdirs),
+    }
+
+def add_finding(url, method, response, paths, results, records, context):
+    record = build_record(method, response, paths)
+    with context.lock:
+        results.append((url, method, response.status_code))
+        records[url] = record
+
+def check_path(url, results, records, progress_bar, context, done):
+    # `done` recebe os subdiretórios a escanear. Páginas HTML vão para a etapa de parsing
+    # (processos separados) e `done` só é chamado quando ela termina: a thread de rede
+    # nunca espera pelo parsing e já segue para o próximo caminho
+    found = find_existing(url, context)
+    with context.lock:
         progress_bar.update(1)
-    semaphore.release()
+    if not found:
+        return done(())
+    method, response = found
+    if method != 'HEAD' and context.soft404.is_soft_404_response(response, url):
+        return done(())
+    if method == 'HEAD' or 'text/html' not in response.headers.get('Content-Type', ''):
+        add_finding(url, method, response, set(), results, records, context)
+        return done(())
+
+    def parsed(paths):
+        paths = paths or set()  # Falha no parsing: o achado vale, só sem recursão
+        try:
+            add_finding(url, method, response, paths, results, records, context)
+        finally:
+            done({urljoin(response.url, path) for path in paths})
+
+    context.parser.submit(extract_subdirectories, response.text, response.url, callback=parsed)
 
 def extract_subdirectories(html, base_url):
     soup = BeautifulSoup(html, 'html.parser')
+    base_host = urlparse(base_url).netloc
     subdirs = set()
     for link in soup.find_all('a', href=True):
         href = link['href']
-        full_url = urljoin(base_url, href)
-        parsed_url = urlparse(full_url)
-        path = parsed_url.path
-        if path and not path.startswith(('/', 'http:', 'https:', '#')):
-            subdirs.add(path)
+        if href.startswith(('#', 'mailto:', 'javascript:')):
+            continue
+        parsed_url = urlparse(urljoin(base_url, href))
+        # Apenas caminhos do mesmo host alimentam a recursão
+        if parsed_url.netloc == base_host and parsed_url.path:
+            subdirs.add(parsed_url.path)
     return subdirs
 
-def directory_enumeration(url):
-    global threads  # Adiciona essa linha para definir threads como global
-    detect_custom_404(url)
-    common_paths = load_common_paths()
+def restore_checkpoint(state, results, records):
+    frontier, completed, findings = state.load()
+    for item, finding in findings.items():
+        results.append((item, finding["method"], finding["status"]))
+        records[item] = finding["record"]
+    if completed or frontier:
+        print(f"Retomando scan: {len(completed)} caminhos concluídos, {len(frontier)} pendentes na fronteira, "
+              f"{len(findings)} achados anteriores")
+    return frontier, completed
+
+def directory_enumeration(url, max_depth=max_depth, paths=None, checkpoint=None, context=None):
+    url = resolve_scheme(url)
+    # Sem contexto, o scan cria um só para si (e o fecha no fim)
+    owns_context = context is None
+    context = context or ScanContext(url)
+    common_paths = load_common_paths() if paths is None else paths
     results = []
-    threads = []
-    progress_bar = tqdm(total=len(common_paths), desc="Buscando diretórios expostos", unit="dir")
+    records = {}
+    stats = context.module_stats('directories', new_probe_stats)
+    parser = context.parser
+    start_time = time.time()
+    start_cpu = time.process_time()
+
+    # Com checkpoint, itens concluídos entram como já visitados e a fronteira pendente é reagendada
+    state = Checkpoint(checkpoint, f"directories:{url}:{max_depth}") if checkpoint else None
+    frontier, completed = restore_checkpoint(state, results, records) if state else ([], set())
+    context.visited.update(completed)
+    progress_bar = tqdm(total=len(common_paths), initial=len(completed), desc="Buscando diretórios expostos", unit="dir")
+
+    def handle(path_url, depth):
+        # O caminho só conta como concluído (no scheduler e no checkpoint) depois do parsing
+        complete = scheduler.defer(depth)
 
+        def done(children):
+            if state:
+                # Filhos antes da conclusão: um flush nunca grava o item sem a sua fronteira
+                if depth < max_depth:
+                    for child in children:
+                        state.add_frontier(child, depth + 1)
+                record = records.get(path_url)
+                if record is not None:
+                    state.add_finding(path_url, {"method": record["method"], "status": record["status"], "record": record})
+                state.mark_completed(path_url)
+            complete(children)
+
+        try:
+            check_path(path_url, results, records, progress_bar, context, done)
+        except Exception:
+            complete(())
+            raise
+
+    scheduler = WorkScheduler(handle, num_workers=context.workers(max_threads), max_depth=max_depth, seen=context.visited)
+    for item, depth in frontier:
+        scheduler.submit(item, depth)
     # Verificar caminhos comuns
     for path in common_paths:
-        full_url = f"{url}/{path}"
-        if full_url not in visited_urls:
-            visited_urls.add(full_url)
-            time.sleep(random.uniform(0.01, 0.1))  # Atraso aleatório entre 10ms e 100ms
-            semaphore.acquire()
-            thread = Thread(target=check_path, args=(full_url, results, progress_bar, http_methods))
-            threads.append(thread)
-            thread.start()
-
-    for thread in threads:
-        thread.join()
-
-    progress_bar.close()
+        scheduler.submit(f"{url}/{path}")
+    try:
+        scheduler.run()
+    finally:
+        progress_bar.close()
+        network_cpu = time.process_time() - start_cpu
+        if owns_context:
+            context.close()
+        if state:
+            state.flush()
+
+    elapsed = time.time() - start_time
+    report_results(results, records, stats, elapsed)
+    report_errors(scheduler.errors)
+    context.soft404.report()
+    parser.report(network_cpu, elapsed)
+    if state:
+        state.report(elapsed)
+        state.clear()
+        state.close()
+    context.set_results('directories', results)
+    return results
+
+def report_errors(errors):
+    # Caminhos cujo processamento falhou: sem isso eles sumiriam do relatório em silêncio
+    if errors:
+        print(f"\nFalha ao processar {len(errors)} caminho(s):")
+        for item, error in errors:
+            print(f"URL: {item} - {error}")
+
+def report_results(results, records, stats, elapsed):
     if results:
         print("\nDiretórios expostos encontrados:")
         for result in results:
@@ -102,10 +244,14 @@ def directory_enumeration(url):
     print("\nRelatório Detalhado:")
     for result in results:
         print(f"URL: {result[0]}, Método: {result[1]}, Status: {result[2]}")
-        response = fetch_url(result[0], method=result[1])
-        if response:
-            print(f"Headers: {response.headers}")
-            if 'text/html' in response.headers.get('Content-Type', ''):
-                subdirs = extract_subdirectories(response.text, result[0])
-                if subdirs:
-                    print(f"Subdiretórios encontrados: {', '.join(subdirs)}")
+        record = records.get(result[0])
+        if record:
+            print(f"Headers: {record['headers']}")
+            if record["body_digest"]:
+                print(f"Corpo: {record['body_length']} bytes, SHA-256 {record['body_digest']}")
+            if record["subdirs"]:
+                print(f"Subdiretórios encontrados: {', '.join(record['subdirs'])}")
+
+    rate = stats["requests"] / elapsed if elapsed else 0
+    print(f"\nRequisições: {stats['requests']} em {elapsed:.2f}s ({rate:.1f} req/s)")
+    print(f"Bytes baixados: {stats['bytes_downloaded']} - Bytes economizados (HEAD primeiro): {stats['bytes_saved']}")
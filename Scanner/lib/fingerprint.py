@@ -0,0 +1,152 @@
+import hashlib
+import random
+import re
+import string
+from collections import Counter
+from threading import Event, Lock
+from urllib.parse import urlparse
+
+from requests.exceptions import RequestException
+
+from . import http_client
+
+SIMHASH_BITS = 64
+MAX_HAMMING_DISTANCE = 6      # Distância máxima entre simhashes para considerar "mesma página"
+LENGTH_BUCKET_SIZE = 512      # Tamanhos são comparados em faixas de 512 bytes (±1 faixa)
+SAMPLE_CHARS = 32 * 1024      # Apenas o início do corpo entra no hash: custo limitado por resposta
+BASELINE_PROBES = 2
+EVIDENCE_CHARS = 240          # Trecho máximo do corpo guardado como evidência
+
+_token_pattern = re.compile(r'\w+')
+
+
+def simhash(text, bits=SIMHASH_BITS):
+    weights = [0] * bits
+    for token, count in Counter(_token_pattern.findall(text.lower())).items():
+        value = int.from_bytes(hashlib.blake2b(token.encode('utf-8', 'replace'), digest_size=8).digest(), 'big')
+        for bit in range(bits):
+            weights[bit] += count if value >> bit & 1 else -count
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+def _strip_echo(text, url):
+    # Páginas de erro costumam repetir o caminho pedido; removemos o eco antes de comparar
+    path = urlparse(url).path
+    for echo in {path, path.rstrip('/').rsplit('/', 1)[-1]}:
+        if len(echo) > 1:
+            text = text.replace(echo, '')
+    return text
+
+
+def response_signature(url, status, text):
+    text = _strip_echo(text[:SAMPLE_CHARS], url)
+    return status, len(text) // LENGTH_BUCKET_SIZE, simhash(text)
+
+
+def matches_signature(signatures, signature):
+    # `signatures` agrupa simhashes por (status, faixa); vizinhos de faixa também contam
+    status, bucket, fingerprint = signature
+    for neighbour in (bucket - 1, bucket, bucket + 1):
+        for known in signatures.get((status, neighbour), ()):
+            if hamming_distance(known, fingerprint) <= MAX_HAMMING_DISTANCE:
+                return True
+    return False
+
+
+def response_record(response, snippet=EVIDENCE_CHARS):
+    # Registro compacto no lugar do corpo inteiro: status, tamanho, hash e um trecho limitado
+    body = response.content or b''
+    return {
+        "status": response.status_code,
+        "length": len(body),
+        "sha256": hashlib.sha256(body).hexdigest(),
+        "snippet": body[:snippet * 4].decode(response.encoding or 'utf-8', errors='replace')[:snippet],
+    }
+
+
+def directory_of(url):
+    parsed = urlparse(url)
+    path = parsed.path
+    directory = path if path.endswith('/') else path.rsplit('/', 1)[0] + '/'
+    return f"{parsed.scheme}://{parsed.netloc}{directory}"
+
+
+def _random_name(length=12):
+    return ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(length))
+
+
+class Soft404Detector:
+    # Guarda, por nível de diretório, as assinaturas (status, faixa de tamanho, simhash)
+    # das respostas a caminhos inexistentes. As assinaturas ficam em cache durante o scan
+    # e cada resposta é classificada por busca direta em (status, faixa).
+    # Diretórios em que todas as sondas falharam ficam em `unprobed` (diretório -> erro):
+    # neles a detecção fica desativada, e o relatório avisa.
+
+    def __init__(self, probes=BASELINE_PROBES, request=None):
+        self.probes = probes
+        self._request = request or http_client.request
+        self._baselines = {}
+        self._lock = Lock()
+        self.unprobed = {}
+
+    def _probe(self, directory):
+        signatures = {}
+        error = None
+        for _ in range(self.probes):
+            probe_url = directory + _random_name()
+            try:
+                response = self._request('GET', probe_url, cache=False)
+            except RequestException as e:
+                error = e
+                continue
+            status, bucket, fingerprint = response_signature(probe_url, response.status_code, response.text)
+            signatures.setdefault((status, bucket), []).append(fingerprint)
+        if not signatures:
+            with self._lock:
+                self.unprobed[directory] = str(error)
+        return signatures
+
+    def report(self):
+        if self.unprobed:
+            print(f"Soft-404: sem linha de base em {len(self.unprobed)} diretório(s), detecção desativada neles:")
+            for directory, error in sorted(self.unprobed.items()):
+                print(f"  {directory}: {error}")
+
+    def baseline(self, url):
+        directory = directory_of(url)
+        entry = self._baselines.get(directory)
+        if entry is None:
+            with self._lock:
+                entry = self._baselines.get(directory)
+                owner = entry is None
+                if owner:
+                    entry = self._baselines[directory] = (Event(), {})
+            if owner:
+                # Só uma thread sonda cada diretório; as demais aguardam o resultado
+                try:
+                    entry[1].update(self._probe(directory))
+                finally:
+                    entry[0].set()
+        entry[0].wait()
+        return entry[1]
+
+    def needs_body(self, url, status):
+        # Sem assinatura de soft-404 com este status, o corpo não muda a classificação
+        return any(known_status == status for known_status, _ in self.baseline(url))
+
+    def is_soft_404(self, url, status, text):
+        signatures = self.baseline(url)
+        if not signatures:
+            return False
+        return matches_signature(signatures, response_signature(url, status, text))
+
+    def is_soft_404_response(self, response, url=None):
+        return self.is_soft_404(url or response.url, response.status_code, response.text)
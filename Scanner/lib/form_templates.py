@@ -0,0 +1,64 @@
+import re
+from urllib.parse import urljoin
+
+USERNAME = 'username'
+PASSWORD = 'password'
+HIDDEN = 'hidden'
+CSRF = 'csrf'
+SUBMIT = 'submit'
+OTHER = 'other'
+
+USERNAME_TYPES = ('text', 'email')
+SUBMIT_TYPES = ('submit', 'button', 'image', 'reset')
+_csrf_pattern = re.compile(r'csrf|xsrf|token|nonce|authenticity', re.IGNORECASE)
+_username_pattern = re.compile(r'user|login|email|mail', re.IGNORECASE)
+
+
+def field_role(input_tag):
+    field_type = (input_tag.get('type') or 'text').lower()
+    name = input_tag.get('name') or ''
+    if field_type == 'password':
+        return PASSWORD
+    if field_type == 'hidden':
+        return CSRF if _csrf_pattern.search(name) else HIDDEN
+    if field_type in SUBMIT_TYPES:
+        return SUBMIT
+    if field_type in USERNAME_TYPES or _username_pattern.search(name):
+        return USERNAME
+    return OTHER
+
+
+class FormTemplate:
+    # Formulário compilado uma única vez a partir da árvore do BeautifulSoup: cada tentativa
+    # só troca os valores dos campos de usuário/senha, sem percorrer o HTML de novo.
+
+    __slots__ = ('action', 'method', 'fields', '_static', '_usernames', '_passwords')
+
+    def __init__(self, action, method, fields):
+        self.action = action
+        self.method = method
+        self.fields = fields  # [(nome, papel, valor padrão)]
+        self._static = {name: value for name, role, value in fields if role not in (USERNAME, PASSWORD)}
+        self._usernames = [name for name, role, _ in fields if role == USERNAME]
+        self._passwords = [name for name, role, _ in fields if role == PASSWORD]
+
+    @classmethod
+    def from_form(cls, form, base_url):
+        action = urljoin(base_url, form.get('action') or base_url)
+        method = form.get('method', 'post').lower()
+        fields = [(input_tag.get('name'), field_role(input_tag), input_tag.get('value', ''))
+                  for input_tag in form.findAll('input') if input_tag.get('name')]
+        return cls(action, method, fields)
+
+    @property
+    def is_login(self):
+        return bool(self._usernames and self._passwords)
+
+    def fill(self, username='', password=''):
+        # Campos ocultos, tokens CSRF e botões mantêm o valor original da página
+        data = dict(self._static)
+        for name in self._usernames:
+            data[name] = username
+        for name in self._passwords:
+            data[name] = password
+        return data
@@ -0,0 +1,183 @@
+import ssl
+import time
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .concurrency import controller_for, controller_stats
+from .response_cache import ResponseCache, cache_key
+
+DEFAULT_TIMEOUT = 5
+DEFAULT_POOL_SIZE = 100  # Conexões keep-alive mantidas por host
+DEFAULT_MAX_HOSTS = 32   # Número de pools por host mantidos em cache
+
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+_lock = Lock()
+_session = None
+response_cache = ResponseCache()
+_config = {
+    "pool_size": DEFAULT_POOL_SIZE,
+    "max_hosts": DEFAULT_MAX_HOSTS,
+    "timeout": DEFAULT_TIMEOUT,
+}
+
+
+class _TLSAdapter(HTTPAdapter):
+    # Um único SSLContext compartilhado por todos os pools: os certificados são
+    # carregados uma vez e as conexões mantidas vivas pelo pool não refazem o handshake.
+    def __init__(self, ssl_context, **kwargs):
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self._ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs["ssl_context"] = self._ssl_context
+        return super().proxy_manager_for(*args, **kwargs)
+
+
+def _build_session():
+    session = requests.Session()
+    # Cada teste deve ser independente: não guardamos cookies entre requisições
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    ssl_context = ssl.create_default_context()
+    adapter = _TLSAdapter(
+        ssl_context,
+        pool_connections=_config["max_hosts"],
+        pool_maxsize=_config["pool_size"],
+        pool_block=False,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure(pool_size=None, max_hosts=None, timeout=None):
+    global _session
+    with _lock:
+        if pool_size is not None:
+            _config["pool_size"] = pool_size
+        if max_hosts is not None:
+            _config["max_hosts"] = max_hosts
+        if timeout is not None:
+            _config["timeout"] = timeout
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _send(method, url, adaptive, kwargs):
+    if not adaptive:
+        return get_session().request(method, url, **kwargs)
+
+    # Toda requisição passa pelo controle de concorrência do host (compartilhado entre módulos)
+    controller = controller_for(url)
+    controller.acquire()
+    start = time.monotonic()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.exceptions.Timeout:
+        controller.release(timed_out=True)
+        raise
+    except BaseException:
+        controller.release()
+        raise
+    controller.release(
+        latency=time.monotonic() - start,
+        status=response.status_code,
+        retry_after=response.headers.get('Retry-After'),
+        method=method.upper(),
+    )
+    return response
+
+
+def request(method, url, cache=False, adaptive=True, **kwargs):
+    # O cache é opcional: só as leituras da página inicial compartilhadas entre módulos passam
+    # cache=True. Payloads e sondas sempre chegam ao servidor. Respostas em stream nunca são guardadas
+    kwargs.setdefault("timeout", _config["timeout"])
+    if not cache or method.upper() not in CACHEABLE_METHODS or kwargs.get("stream"):
+        return _send(method, url, adaptive, kwargs)
+
+    key = cache_key(method, url, kwargs.get("data"), kwargs.get("json"), kwargs.get("params"))
+    response = response_cache.get(key)
+    if response is None:
+        response = _send(method, url, adaptive, kwargs)
+        response_cache.put(key, response)
+    return response
+
+
+def clear_cache():
+    # Chamado a cada nova execução: um scan refeito não recebe respostas do anterior
+    response_cache.clear()
+
+
+def _iter_pools():
+    session = _session
+    if session is None:
+        return
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                yield pool
+
+
+def connection_stats():
+    hosts = {}
+    for pool in _iter_pools():
+        host = f"{pool.scheme}://{pool.host}:{pool.port}"
+        stats = hosts.setdefault(host, {"connections": 0, "requests": 0})
+        stats["connections"] += pool.num_connections
+        stats["requests"] += pool.num_requests
+
+    total_connections = sum(s["connections"] for s in hosts.values())
+    total_requests = sum(s["requests"] for s in hosts.values())
+    reused = max(total_requests - total_connections, 0)
+    return {
+        "hosts": hosts,
+        "connections_opened": total_connections,
+        "requests": total_requests,
+        "connections_reused": reused,
+        "reuse_rate": (reused / total_requests) * 100 if total_requests else 0,
+        "pool_size": _config["pool_size"],
+        "cache": response_cache.stats(),
+        "concurrency": controller_stats(),
+    }
+
+
+def print_connection_stats():
+    stats = connection_stats()
+    print(f"\nConexões HTTP: {stats['requests']} requisições, "
+          f"{stats['connections_opened']} conexões abertas, "
+          f"{stats['connections_reused']} reutilizadas ({stats['reuse_rate']:.1f}%)")
+    cache = stats["cache"]
+    print(f"Cache de respostas: {cache['hits']} acertos, {cache['misses']} falhas "
+          f"({cache['hit_rate']:.1f}%), {cache['entries']} entradas")
+    for host, control in stats["concurrency"].items():
+        print(f"Concorrência adaptativa {host}: limite {control['limit']}, "
+              f"latência média {control['avg_latency'] * 1000:.0f} ms, "
+              f"{control['timeouts']} timeouts, {control['overloaded']} respostas 429/503, "
+              f"{control['pauses']} pausas por Retry-After")
+
+
+def close():
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
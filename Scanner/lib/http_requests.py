@@ -1,6 +1,7 @@
 import requests
 import random
 import time
+from . import http_client
 
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36",
@@ -13,7 +14,7 @@ USER_AGENTS = [
 def get_random_user_agent():
     return random.choice(USER_AGENTS)
 
-def fetch_url(url, method='GET'):
+def fetch_url(url, method='GET', cache=False, adaptive=True):
     headers = {
         "User-Agent": get_random_user_agent()
     }
@@ -21,14 +22,14 @@ def fetch_url(url, method='GET'):
         try:
             # Primeiro tenta com HTTPS
             test_url = 'https://' + url
-            response = requests.request(method, test_url, headers=headers, timeout=5)
+            response = http_client.request(method, test_url, cache=cache, adaptive=adaptive, headers=headers)
             if response.ok:
                 return response
         except requests.exceptions.RequestException:
             # Se HTTPS falhar, tenta com HTTP
             try:
                 test_url = 'http://' + url
-                response = requests.request(method, test_url, headers=headers, timeout=5)
+                response = http_client.request(method, test_url, cache=cache, adaptive=adaptive, headers=headers)
                 if response.ok:
                     return response
             except requests.exceptions.RequestException as e:
@@ -36,10 +37,20 @@ def fetch_url(url, method='GET'):
                 return None
     else:
         try:
-            response = requests.request(method, url, headers=headers, timeout=5)
+            response = http_client.request(method, url, cache=cache, adaptive=adaptive, headers=headers)
             if response.ok:
                 return response
         except requests.exceptions.RequestException as e:
             print(f"Erro ao conectar a {url}: {e}")
             return None
     return None
+
+def resolve_scheme(url):
+    # Resolve uma vez o esquema de uma URL sem http(s)://, com a mesma preferência do fetch_url
+    if url.startswith(('http://', 'https://')):
+        return url
+    try:
+        http_client.request('HEAD', 'https://' + url, cache=False, headers={"User-Agent": get_random_user_agent()})
+        return 'https://' + url
+    except requests.exceptions.RequestException:
+        return 'http://' + url
@@ -0,0 +1,80 @@
+from urllib.parse import parse_qsl, urljoin, urlparse, urlunparse
+
+from bs4 import BeautifulSoup
+from requests.exceptions import RequestException
+
+from . import http_client
+from .content_analysis import analyze_forms
+
+DEFAULT_PARAM = 'id'
+FILLER_VALUE = '1'
+SKIPPED_FIELD_TYPES = ('submit', 'button', 'reset', 'image', 'file')
+
+
+def strip_query(url):
+    return urlunparse(urlparse(url)._replace(query='', fragment=''))
+
+
+def injection_point(method, url, param, params):
+    # Um ponto de injeção: o parâmetro testado e os demais campos com valores fixos
+    return {"method": method, "url": url, "param": param, "params": params}
+
+
+def default_injection_points(url):
+    return [injection_point(method, url, DEFAULT_PARAM, {}) for method in ('GET', 'POST')]
+
+
+def query_points(url):
+    params = dict(parse_qsl(urlparse(url).query, keep_blank_values=True))
+    base_url = strip_query(url)
+    points = []
+    for param in params:
+        others = {name: value for name, value in params.items() if name != param}
+        points.append(injection_point('GET', base_url, param, others))
+        points.append(injection_point('POST', base_url, param, others))
+    return points
+
+
+def form_points(url, html):
+    result = {"forms": []}
+    analyze_forms(BeautifulSoup(html, 'html.parser'), result)
+    points = []
+    for form in result["forms"]:
+        action = url if form["action"] == 'N/A' else urljoin(url, form["action"])
+        if urlparse(action).netloc != urlparse(url).netloc:
+            continue
+        method = 'POST' if form["method"] == 'POST' else 'GET'
+        names = [field["name"] for field in form["fields"]
+                 if field["name"] != 'N/A' and field["type"] not in SKIPPED_FIELD_TYPES]
+        for param in dict.fromkeys(names):
+            others = {name: FILLER_VALUE for name in names if name != param}
+            points.append(injection_point(method, strip_query(action), param, others))
+    return points
+
+
+def discover_injection_points(url, html=None, request=None):
+    # Parâmetros da query string e dos formulários da página; sem nenhum, o parâmetro
+    # padrão `id` em GET e POST (comportamento original dos testes de SQLi).
+    # `request` é o context.request do scan, para a busca entrar no mesmo orçamento
+    points = query_points(url)
+    if html is None:
+        try:
+            html = (request or http_client.request)('GET', url).text
+        except RequestException:
+            html = ''
+    points.extend(form_points(url, html))
+
+    unique = {}
+    for point in points:
+        key = (point["method"], point["url"], point["param"], tuple(sorted(point["params"])))
+        unique.setdefault(key, point)
+    return list(unique.values()) or default_injection_points(strip_query(url))
+
+
+def point_label(point):
+    return f"{point['method']} {point['url']} [{point['param']}]"
+
+
+def request_kwargs(point, value):
+    fields = dict(point["params"], **{point["param"]: value})
+    return {"params": fields} if point["method"] == 'GET' else {"data": fields}
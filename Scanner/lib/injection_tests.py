@@ -1,98 +1,114 @@
-from .http_requests import fetch_url
-from threading import Thread, Lock, Semaphore
-import requests
+import time
+from . import http_client
+from .injection_points import discover_injection_points, point_label, request_kwargs
+from .response_cache import cache_key
+from . import corpus
+from .scan_context import ScanContext
+from .sql_errors import find_sql_error
+from concurrent.futures import ThreadPoolExecutor
 from requests.exceptions import RequestException
-import os
 from tqdm import tqdm
 
-lock = Lock()
-semaphore = Semaphore(100)  # Número máximo de threads simultâneas
-http_methods = ['GET', 'POST']
-custom_404_text = ""
-
-error_indicators = [
-    'you have an error in your sql syntax;',
-    'warning: mysql',
-    'unclosed quotation mark after the character string',
-    'quoted string not properly terminated',
-    'sql error',
-    'syntax error'
-]
+max_workers = 100  # Teto de threads; o número real de requisições em voo é ajustado por host em http_client
 
 
 def load_sqli_payloads():
-    directory_of_this_script = os.path.dirname(__file__)
-    path_to_sqli_payloads = os.path.join(directory_of_this_script, 'SecList', 'Fuzzing', 'SQLi', 'quick-SQLi.txt')
-    if not os.path.exists(path_to_sqli_payloads):
-        raise FileNotFoundError(f"O arquivo 'sql_injection.txt' não foi encontrado em: {path_to_sqli_payloads}")
-    with open(path_to_sqli_payloads, 'r', encoding='latin-1') as file:
-        return [line.strip() for line in file if line.strip()]
-
-
-def detect_custom_404(url):
-    response = fetch_url(url + "/nonexistentpath", method='GET')
-    global custom_404_text
-    if response and response.status_code == 404:
-        custom_404_text = response.text
-
+    return corpus.entries('sqli-quick')
 
-def is_custom_404(response):
-    return custom_404_text and custom_404_text in response.text
 
-
-def fetch_url(url, method='GET', data=None):
+def fetch_url(url, method='GET', data=None, params=None, context=None):
     if not url.startswith(('http://', 'https://')):
         url = 'http://' + url  # Assume http como padrão se nenhum esquema for fornecido
+    request = context.request if context else http_client.request
     try:
         if method == 'GET':
-            response = requests.get(url, timeout=5)
+            response = request('GET', url, params=params, cache=False)
         elif method == 'POST':
-            response = requests.post(url, data=data, timeout=5)
+            response = request('POST', url, data=data, cache=False)
         return response if response.status_code not in [404] else None
     except RequestException as e:
 
         return None
 
 
-def check_sqli(url, payload, method, results, progress_bar):
-    if method == 'GET':
-        full_url = f"{url}?id={payload}"
-        response = fetch_url(full_url, method=method)
-    elif method == 'POST':
-        full_url = url
-        data = {'id': payload}
-        response = fetch_url(full_url, method=method, data=data)
+def plan_requests(points, payloads):
+    # Agrupa (ponto, payload) por requisição final: pontos que levariam ao mesmo
+    # método/URL/campos compartilham uma única requisição
+    planned = {}
+    for payload in payloads:
+        for point in points:
+            kwargs = request_kwargs(point, payload)
+            key = cache_key(point["method"], point["url"], kwargs.get("data"), params=kwargs.get("params"))
+            planned.setdefault(key, (point["method"], point["url"], kwargs, []))[3].append((point, payload))
+    return list(planned.values())
+
+
+def new_param_stats():
+    return {"requests": 0, "start": None, "end": None}
+
 
-    if response and any(error in response.text.lower() for error in error_indicators) and not is_custom_404(response):
-        with lock:
-            results.append((full_url, method, payload))
+def check_sqli(method, url, kwargs, owners, results, stats, progress_bar, context):
+    started = time.monotonic()
+    response = fetch_url(url, method=method, context=context, **kwargs)
+    finished = time.monotonic()
 
-    with lock:
+    sql_error = find_sql_error(response.content) if response else None
+    if sql_error and context.soft404.is_soft_404_response(response, url):
+        sql_error = None
+
+    with context.lock:
+        for point, payload in owners:
+            if sql_error:
+                results.append((response.url if method == 'GET' else url, method, point["param"], payload, sql_error[0]))
+            entry = stats.setdefault(point_label(point), new_param_stats())
+            entry["requests"] += 1
+            entry["start"] = started if entry["start"] is None else min(entry["start"], started)
+            entry["end"] = finished if entry["end"] is None else max(entry["end"], finished)
         progress_bar.update(1)
-    semaphore.release()
-
-
-def test_sqli(url):
-    sqli_payloads = load_sqli_payloads()
-    results = []
-    threads = []
-    total_tests = len(sqli_payloads) * len(http_methods)
-    progress_bar = tqdm(total=total_tests, desc="Testando SQL Injection", unit="test")
-
-    for payload in sqli_payloads:
-        for method in http_methods:
-            semaphore.acquire()
-            thread = Thread(target=check_sqli, args=(url, payload, method, results, progress_bar))
-            threads.append(thread)
-            thread.start()
-
-    for thread in threads:
-        thread.join()
-
-    progress_bar.close()
-    if results:
-        print("\nPossíveis vulnerabilidades de SQLi encontradas:")
-        for result in results:
-            print(f"URL: {result[0]} - Método: {result[1]} - Payload: {result[2]}")
-    else:
-        print("\nNenhuma vulnerabilidade de SQLi encontrada.")
+
+
+def report_throughput(stats, planned_total, sent_total, elapsed):
+    print(f"\n{sent_total} requisições enviadas ({planned_total - sent_total} duplicadas evitadas) "
+          f"em {elapsed:.2f}s ({sent_total / elapsed if elapsed else 0:.1f} req/s)")
+    for label, entry in stats.items():
+        window = (entry["end"] - entry["start"]) if entry["start"] is not None else 0
+        rate = entry["requests"] / window if window else 0
+        print(f"  {label}: {entry['requests']} requisições - {rate:.1f} req/s")
+
+
+def test_sqli(url, points=None, context=None, html=None):
+    # `html`: página inicial já baixada pelo chamador, para não buscá-la de novo
+    if not url.startswith(('http://', 'https://')):
+        url = 'http://' + url
+    # Sem contexto, o teste cria um só para si (e o fecha no fim)
+    owns_context = context is None
+    context = context or ScanContext(url)
+    try:
+        sqli_payloads = load_sqli_payloads()
+        points = points or discover_injection_points(url, html, context.request)
+        results = []
+        stats = context.module_stats('sqli')
+        planned = plan_requests(points, sqli_payloads)
+        planned_total = len(points) * len(sqli_payloads)
+        print(f"Testando {len(points)} parâmetro(s): " + ", ".join(point_label(point) for point in points))
+        progress_bar = tqdm(total=len(planned), desc="Testando SQL Injection", unit="test")
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=context.workers(max_workers)) as executor:
+            for method, request_url, kwargs, owners in planned:
+                executor.submit(check_sqli, method, request_url, kwargs, owners, results, stats, progress_bar, context)
+        elapsed = time.monotonic() - start
+
+        progress_bar.close()
+        if results:
+            print("\nPossíveis vulnerabilidades de SQLi encontradas:")
+            for result in results:
+                print(f"URL: {result[0]} - Método: {result[1]} - Parâmetro: {result[2]} - Payload: {result[3]} - SGBD: {result[4]}")
+        else:
+            print("\nNenhuma vulnerabilidade de SQLi encontrada.")
+        report_throughput(stats, planned_total, len(planned), elapsed)
+        context.set_results('sqli', results)
+        return results
+    finally:
+        if owns_context:
+            context.close()
@@ -0,0 +1,84 @@
+from collections import deque
+
+try:
+    import ahocorasick  # pyahocorasick (C), opcional
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordIndex:
+    # Autômato de Aho-Corasick com todas as palavras-chave: um texto é classificado em
+    # uma única varredura, em tempo linear no tamanho do texto (mais as ocorrências),
+    # em vez de uma busca de substring por palavra-chave. A comparação ignora maiúsculas.
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+        self.max_length = max(map(len, self.keywords), default=0)
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            if self.keywords:
+                self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            self._build()
+
+    def _build(self):
+        # Trie de transições, links de falha e, por estado, todas as palavras que terminam nele
+        goto = [{}]
+        output = [()]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    output.append(())
+                state = next_state
+            output[state] = (keyword,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(char, 0) if state else 0
+                # O estado de falha é mais raso, então sua saída já está completa
+                output[child] += output[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def __reduce__(self):
+        # Processos de parsing recebem só a lista de palavras e reconstroem o autômato
+        return KeywordIndex, (self.keywords,)
+
+    def find(self, text):
+        # Palavras-chave contidas em `text`, na ordem da primeira ocorrência
+        text = text.lower()
+        if self._automaton is not None:
+            if not self.keywords:
+                return []
+            return list(dict.fromkeys(keyword for _, keyword in self._automaton.iter(text)))
+
+        goto, fail, output = self._goto, self._fail, self._output
+        found = {}
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(dict.fromkeys(output[state]))
+        return list(found)
+
+    def __len__(self):
+        return len(self.keywords)
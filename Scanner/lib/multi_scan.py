@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .http_requests import resolve_scheme
+from .parse_pool import available_cores
+from .scan_context import DEFAULT_BUDGET, ScanContext
+
+PARALLEL_TARGETS = 4  # Alvos escaneados ao mesmo tempo
+DEFAULT_SCANS = ('directories', 'sqli', 'authentication')
+
+
+def run_directories(url, context):
+    from .directory_enumeration import directory_enumeration
+    return directory_enumeration(url, context=context)
+
+
+def run_sqli(url, context):
+    from .injection_tests import test_sqli
+    return test_sqli(url, context=context)
+
+
+def run_blind_sqli(url, context):
+    from .blind_sqli import test_blind_sqli
+    return test_blind_sqli(url, context=context)
+
+
+def run_authentication(url, context):
+    from .authentication_tests import test_authentication
+    return test_authentication(url, context=context)
+
+
+SCANS = {
+    'directories': run_directories,
+    'sqli': run_sqli,
+    'blind_sqli': run_blind_sqli,
+    'authentication': run_authentication,
+}
+
+
+def scan_target(url, scans=DEFAULT_SCANS, budget=DEFAULT_BUDGET, parse_workers=None):
+    # Os módulos de um alvo rodam em sequência e compartilham o contexto (soft-404,
+    # URLs visitadas, orçamento); alvos diferentes nunca compartilham estado
+    url = resolve_scheme(url)
+    with ScanContext(url, budget=budget, parse_workers=parse_workers) as context:
+        for name in scans:
+            try:
+                SCANS[name](url, context)
+            except Exception as e:
+                context.set_results(name, None)
+                context.module_stats('errors', list).append((name, str(e)))
+        return context
+
+
+def run_targets(targets, scans=DEFAULT_SCANS, parallel=PARALLEL_TARGETS, budget=DEFAULT_BUDGET):
+    # Vários alvos no mesmo processo, cada um com o seu ScanContext e o seu orçamento
+    start = time.monotonic()
+    contexts = {}
+    parallel = max(1, parallel)
+    # Os núcleos são divididos entre os alvos simultâneos, para os processos de parsing não disputarem CPU
+    parse_workers = max(1, available_cores() // min(parallel, len(targets) or 1))
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        futures = {executor.submit(scan_target, target, scans, budget, parse_workers): target for target in targets}
+        for future in as_completed(futures):
+            contexts[futures[future]] = future.result()
+    report_targets(contexts, time.monotonic() - start)
+    return contexts
+
+
+def report_targets(contexts, elapsed):
+    print(f"\nResumo de {len(contexts)} alvo(s) em {elapsed:.2f}s:")
+    for target, context in contexts.items():
+        summary = context.summary()
+        findings = ", ".join(f"{name}: {'erro' if count is None else count}"
+                             for name, count in summary["findings"].items())
+        print(f"  {summary['target']}: {summary['requests']} requisições em {summary['elapsed']:.2f}s, "
+              f"pico de {summary['peak_in_flight']}/{summary['budget']} em voo - {findings}")
+        for name, error in context.stats.get('errors', ()):
+            print(f"    {name}: {error}")
@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import BrokenExecutor, Future, InvalidStateError, ProcessPoolExecutor
+from threading import Lock
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _start_method():
+    # forkserver evita copiar as threads de rede do processo principal (fork com threads é inseguro)
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _timed(func, args):
+    start = time.process_time()
+    result = func(*args)
+    return result, time.process_time() - start
+
+
+class ParsePool:
+    # Etapa de parsing separada da rede: o HTML é analisado em processos próprios, fora do
+    # GIL e dos locks do scan. As threads de rede só entregam o texto e seguem para a próxima
+    # requisição; o resultado volta por callback (ou pelo future) quando o parsing termina.
+    # Se os processos não puderem ser usados, o parsing continua no processo principal.
+
+    def __init__(self, workers=None, initializer=None, initargs=()):
+        self.workers = workers or available_cores()
+        self._initializer = initializer
+        self._initargs = initargs
+        self._executor = None
+        self._broken = False
+        self._initialized = False  # Inicializador já executado no processo principal
+        self._lock = Lock()
+        self.stats = {"tasks": 0, "errors": 0, "inline": 0, "cpu_time": 0.0, "first": None, "last": None}
+
+    def _pool(self):
+        with self._lock:
+            if self._broken:
+                raise BrokenExecutor("processos de parsing indisponíveis")
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_start_method(),
+                                                     initializer=self._initializer, initargs=self._initargs)
+            return self._executor
+
+    def submit(self, func, *args, callback=None):
+        # O future devolve (resultado, CPU gasta no parsing); `callback` recebe só o
+        # resultado, ou None se o parsing falhar
+        future = Future()
+        with self._lock:
+            self.stats["tasks"] += 1
+            if self.stats["first"] is None:
+                self.stats["first"] = time.monotonic()
+        try:
+            task = self._pool().submit(_timed, func, args)
+        except RuntimeError:
+            # Pool quebrado ou já encerrado
+            self._run_inline(future, func, args, callback)
+        else:
+            task.add_done_callback(lambda done: self._finished(done, future, func, args, callback))
+        return future
+
+    def _finished(self, task, future, func, args, callback):
+        if task.cancelled():
+            future.cancel()
+            return
+        error = task.exception()
+        if isinstance(error, BrokenExecutor):
+            # Um processo morreu ou não conseguiu subir (ex.: script sem `if __name__ == "__main__"`)
+            with self._lock:
+                warn, self._broken = not self._broken, True
+            if warn:
+                print(f"Processos de parsing indisponíveis ({error}); o parsing continua no processo principal.")
+            return self._run_inline(future, func, args, callback)
+        self._deliver(future, task.result() if error is None else None, error, callback)
+
+    def _run_inline(self, future, func, args, callback):
+        with self._lock:
+            self.stats["inline"] += 1
+            initialize = None if self._initialized else self._initializer
+            self._initialized = True
+        try:
+            if initialize:
+                # O estado que cada processo receberia passa a valer no processo principal
+                initialize(*self._initargs)
+            outcome, error = _timed(func, args), None
+        except Exception as e:
+            outcome, error = None, e
+        self._deliver(future, outcome, error, callback)
+
+    def _deliver(self, future, outcome, error, callback):
+        with self._lock:
+            self.stats["last"] = time.monotonic()
+            if error is None:
+                self.stats["cpu_time"] += outcome[1]
+            else:
+                self.stats["errors"] += 1
+        try:
+            if error is None:
+                future.set_result(outcome)
+            else:
+                future.set_exception(error)
+        except InvalidStateError:
+            return  # Cancelado por quem esperava o resultado
+        if callback:
+            callback(None if error is not None else outcome[0])
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def report(self, network_cpu, elapsed):
+        # Quantos núcleos cada etapa ocupou em média: CPU consumida / tempo de parede
+        stats = self.stats
+        span = (stats["last"] - stats["first"]) if stats["first"] is not None and stats["last"] is not None else 0
+        cores = available_cores()
+        print(f"CPU: processo principal {network_cpu:.2f}s em {elapsed:.2f}s ({network_cpu / elapsed if elapsed else 0:.2f} núcleo) - "
+              f"parsing {stats['cpu_time']:.2f}s em {stats['tasks']} páginas, {self.workers} processo(s), "
+              f"{stats['cpu_time'] / span if span else 0:.2f} de {min(self.workers, cores)} núcleo(s) ocupados "
+              f"({cores} disponíveis)" + (f", {stats['inline']} no processo principal" if stats["inline"] else "")
+              + (f", {stats['errors']} falhas" if stats["errors"] else ""))
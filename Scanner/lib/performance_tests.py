@@ -31,7 +31,7 @@ def stress_test(url, num_requests, num_threads, interval_ms, duration=None):
     def make_request():
         try:
             start_time = time.time()
-            resp = fetch_url(url)
+            resp = fetch_url(url, cache=False, adaptive=False)  # A carga é definida pelo teste, não pelo controle adaptativo
             elapsed_time = time.time() - start_time
             results["response_times"].append(elapsed_time)
             if resp and resp.status_code == 200:
@@ -78,7 +78,7 @@ def load_test(url, num_requests, interval_ms):
     def make_request():
         try:
             start_time = time.time()
-            resp = fetch_url(url)
+            resp = fetch_url(url, cache=False, adaptive=False)  # A carga é definida pelo teste, não pelo controle adaptativo
             elapsed_time = time.time() - start_time
             results["response_times"].append(elapsed_time)
             if resp and resp.status_code == 200:
@@ -110,7 +110,7 @@ def dos_test(url, num_requests, interval_ms):
     def make_request():
         try:
             start_time = time.time()
-            resp = fetch_url(url)
+            resp = fetch_url(url, cache=False, adaptive=False)  # A carga é definida pelo teste, não pelo controle adaptativo
             elapsed_time = time.time() - start_time
             results["response_times"].append(elapsed_time)
             if resp and resp.status_code == 200:
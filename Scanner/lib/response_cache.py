@@ -0,0 +1,88 @@
+import json
+import time
+from collections import OrderedDict
+from threading import Lock
+from urllib.parse import urlencode
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TTL = 120  # segundos; cobre a duração de um scan sem servir páginas antigas em execuções futuras
+
+
+def cache_key(method, url, data=None, json_body=None, params=None):
+    if params:
+        url = f"{url}?{urlencode(params, doseq=True)}"
+    if json_body is not None:
+        body = json.dumps(json_body, sort_keys=True)
+    elif isinstance(data, dict):
+        body = tuple(sorted((str(k), str(v)) for k, v in data.items()))
+    elif isinstance(data, (list, tuple)):
+        body = tuple(data)
+    else:
+        body = data
+    return method.upper(), url, body
+
+
+class ResponseCache:
+    # Cache LRU de respostas com expiração por TTL e limite de entradas e de bytes.
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            response, size, expires = entry
+            if expires < now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key, response):
+        size = len(response.content or b'')
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (response, size, time.monotonic() + self.ttl)
+            self._size += size
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) * 100 if lookups else 0,
+            }
@@ -0,0 +1,107 @@
+import time
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Lock
+
+from . import http_client
+from .fingerprint import Soft404Detector
+from .parse_pool import ParsePool
+from .url_frontier import VisitedSet
+
+DEFAULT_BUDGET = 64  # Requisições simultâneas de um scan (o controle AIMD por host continua valendo)
+
+
+class ScanContext:
+    # Todo o estado de um scan: lock, URLs visitadas, detector de soft-404, estatísticas,
+    # resultados por módulo e orçamento de concorrência. Nada disso fica em variáveis de
+    # módulo, então scans seguidos ou simultâneos no mesmo processo não interferem entre si.
+    # `parse_workers` é o número de processos da etapa de parsing (padrão: um por núcleo).
+
+    def __init__(self, target, budget=DEFAULT_BUDGET, parse_workers=None):
+        self.target = target
+        self.budget = budget
+        self.parse_workers = parse_workers
+        self.lock = Lock()
+        self.soft404 = Soft404Detector(request=self.request)
+        self.stats = {}
+        self.results = {}
+        self.started = time.monotonic()
+        self._slots = BoundedSemaphore(budget)
+        self._visited = None
+        self._parser = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+
+    @property
+    def visited(self):
+        # Criado só quando um módulo precisa (Bloom + SQLite em arquivo temporário)
+        with self.lock:
+            if self._visited is None:
+                self._visited = VisitedSet()
+            return self._visited
+
+    @property
+    def parser(self):
+        # Os processos só sobem no primeiro HTML enviado para parsing
+        with self.lock:
+            if self._parser is None:
+                self._parser = ParsePool(self.parse_workers)
+            return self._parser
+
+    def workers(self, limit):
+        # Threads além do orçamento ficariam só esperando vaga
+        return max(1, min(limit, self.budget))
+
+    @contextmanager
+    def slot(self):
+        # Uma vaga do orçamento; quem mede latência inicia o relógio depois de obtê-la
+        with self._slots:
+            with self.lock:
+                self.in_flight += 1
+                self.requests += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                yield
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+
+    def request(self, method, url, **kwargs):
+        # Com stream=True a vaga é liberada quando chegam os cabeçalhos, não o corpo
+        with self.slot():
+            return http_client.request(method, url, **kwargs)
+
+    def module_stats(self, name, factory=dict):
+        with self.lock:
+            if name not in self.stats:
+                self.stats[name] = factory()
+            return self.stats[name]
+
+    def set_results(self, name, results):
+        with self.lock:
+            self.results[name] = results
+
+    def summary(self):
+        return {
+            "target": self.target,
+            "elapsed": time.monotonic() - self.started,
+            "requests": self.requests,
+            "budget": self.budget,
+            "peak_in_flight": self.peak_in_flight,
+            "findings": {name: None if results is None else len(results) for name, results in self.results.items()},
+        }
+
+    def close(self):
+        with self.lock:
+            if self._visited is not None:
+                self._visited.close()
+                self._visited = None
+            parser, self._parser = self._parser, None
+        if parser is not None:
+            parser.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,110 @@
+import heapq
+import itertools
+from threading import Condition, Lock, Thread
+
+
+class WorkScheduler:
+    # Pool fixo de workers consumindo uma fronteira de prioridade (menor profundidade primeiro).
+    # O handler recebe (item, depth) e devolve os itens filhos a serem agendados em depth + 1,
+    # ou chama defer() e entrega os filhos depois (ex.: quando o parsing termina em outro processo).
+    # O lock interno só protege operações O(1)/O(log n) sobre a fronteira, nunca I/O: a
+    # deduplicação acontece antes, fora dele. `seen` pode ser um set comum ou um objeto com
+    # add() atômico que devolve se o item era novo (ex.: VisitedSet, que consulta o SQLite).
+
+    def __init__(self, handler, num_workers=60, max_depth=3, seen=None):
+        self.handler = handler
+        self.num_workers = num_workers
+        self.max_depth = max_depth
+        self.seen = seen if seen is not None else set()
+        self._seen_lock = Lock()
+        self._claim = self._claim_set if isinstance(self.seen, set) else self.seen.add
+        self._frontier = []
+        self._counter = itertools.count()
+        self._condition = Condition()
+        self._active = 0
+        self._deferred = 0  # Itens cujos filhos ainda vão chegar por defer()
+        self._closed = False
+        self.errors = []
+
+    def submit(self, item, depth=0, priority=None):
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        if not self._claim(item):
+            return False
+        with self._condition:
+            key = depth if priority is None else priority
+            heapq.heappush(self._frontier, (key, next(self._counter), item, depth))
+            self._condition.notify()
+        return True
+
+    def _claim_set(self, item):
+        with self._seen_lock:
+            if item in self.seen:
+                return False
+            self.seen.add(item)
+            return True
+
+    def _next(self):
+        with self._condition:
+            while not self._frontier and not self._closed:
+                if self._active == 0 and self._deferred == 0:
+                    # Fronteira vazia e nenhum worker produzindo: fim do trabalho
+                    self._closed = True
+                    self._condition.notify_all()
+                    break
+                self._condition.wait()
+            if self._closed:
+                return None
+            _, _, item, depth = heapq.heappop(self._frontier)
+            self._active += 1
+            return item, depth
+
+    def _done(self):
+        with self._condition:
+            self._active -= 1
+            if self._active == 0 and self._deferred == 0 and not self._frontier:
+                self._condition.notify_all()
+
+    def defer(self, depth):
+        # O scan só termina depois que a função devolvida for chamada com os filhos;
+        # chamadas repetidas (ex.: no tratamento de erro) são ignoradas
+        pending = [True]
+        with self._condition:
+            self._deferred += 1
+
+        def complete(children=()):
+            with self._condition:
+                if not pending:
+                    return
+                pending.clear()
+            for child in children or ():
+                self.submit(child, depth + 1)
+            with self._condition:
+                self._deferred -= 1
+                if self._active == 0 and self._deferred == 0 and not self._frontier:
+                    self._condition.notify_all()
+
+        return complete
+
+    def _worker(self):
+        while True:
+            task = self._next()
+            if task is None:
+                return
+            item, depth = task
+            try:
+                children = self.handler(item, depth) or ()
+                for child in children:
+                    self.submit(child, depth + 1)
+            except Exception as e:
+                with self._condition:
+                    self.errors.append((item, f"{type(e).__name__}: {e}"))
+            finally:
+                self._done()
+
+    def run(self):
+        workers = [Thread(target=self._worker, daemon=True) for _ in range(self.num_workers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
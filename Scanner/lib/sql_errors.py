@@ -0,0 +1,76 @@
+import re
+from threading import Lock
+
+# Indicadores de erro de SQL agrupados por SGBD; novos grupos podem ser adicionados com register_indicators
+ERROR_INDICATORS = {
+    'mysql': [
+        'you have an error in your sql syntax;',
+        'warning: mysql',
+    ],
+    'mssql': [
+        'unclosed quotation mark after the character string',
+    ],
+    'oracle': [
+        'quoted string not properly terminated',
+    ],
+    'generic': [
+        'sql error',
+        'syntax error',
+    ],
+}
+
+REGEX_THRESHOLD = 40
+
+_lock = Lock()
+_matcher = None
+
+
+def register_indicators(dbms, indicators):
+    global _matcher
+    with _lock:
+        known = ERROR_INDICATORS.setdefault(dbms, [])
+        known.extend(indicator.lower() for indicator in indicators if indicator.lower() not in known)
+        _matcher = None
+
+
+def compile_matcher():
+    # Compilado uma vez (e novamente só após register_indicators). Com poucos indicadores,
+    # buscas diretas em bytes são mais rápidas que uma regex no CPython; acima de
+    # REGEX_THRESHOLD indicadores, uma única regex combinada varre o corpo uma só vez.
+    global _matcher
+    if _matcher is not None:
+        return _matcher
+    with _lock:
+        if _matcher is None:
+            entries = []
+            seen = set()
+            for dbms, indicators in ERROR_INDICATORS.items():
+                for indicator in indicators:
+                    encoded = indicator.lower().encode('utf-8')
+                    if encoded not in seen:
+                        seen.add(encoded)
+                        entries.append((encoded, dbms))
+            pattern = None
+            if len(entries) > REGEX_THRESHOLD:
+                pattern = re.compile(b'|'.join(re.escape(encoded) for encoded, _ in
+                                               sorted(entries, key=lambda entry: len(entry[0]), reverse=True)))
+            _matcher = (tuple(entries), dict(entries), pattern)
+        return _matcher
+
+
+def find_sql_error(content):
+    # Devolve (sgbd, indicador encontrado) ou None. O corpo é tratado em bytes e convertido
+    # para minúsculas uma única vez, em vez de decodificar e copiar o texto por indicador.
+    if isinstance(content, str):
+        content = content.encode('utf-8', errors='replace')
+    entries, by_indicator, pattern = compile_matcher()
+    lowered = content.lower()
+    if pattern is not None:
+        match = pattern.search(lowered)
+        if match:
+            return by_indicator[match.group()], match.group().decode('utf-8')
+        return None
+    for encoded, dbms in entries:
+        if encoded in lowered:
+            return dbms, encoded.decode('utf-8')
+    return None
@@ -1,11 +1,11 @@
-import requests
 import json
 from tqdm import tqdm
 import sys
+from . import http_client
 
 def get_subdomains_from_crtsh(domain):
     url = f"https://crt.sh/?q=%.{domain}&output=json"
-    response = requests.get(url)
+    response = http_client.request('GET', url, timeout=None)
     if response.status_code != 200:
         raise Exception("Failed to fetch data from crt.sh")
 
@@ -0,0 +1,177 @@
+import hashlib
+import math
+import os
+import sqlite3
+import tempfile
+from collections import deque
+from threading import Lock
+
+BLOOM_CAPACITY = 1_000_000   # URLs previstas; acima disso a taxa de falsos positivos sobe aos poucos
+BLOOM_ERROR_RATE = 0.01
+COMMIT_EVERY = 1000          # Inserções no SQLite agrupadas por transação
+MEMORY_QUEUE = 10_000        # URLs pendentes mantidas em memória; o excedente vai para o disco
+REFILL_BATCH = 5_000
+
+
+def url_digest(url):
+    return hashlib.blake2b(url.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class BloomFilter:
+    # Conjunto probabilístico: sem falsos negativos e com ~1% de falsos positivos na
+    # capacidade nominal, em ~1,2 MB para um milhão de itens (um set de URLs usa centenas de MB).
+
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest):
+        # Hash duplo (Kirsch-Mitzenmacher) sobre um único digest de 128 bits
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add_digest(self, digest):
+        # Devolve True se algum bit mudou, isto é, se o item certamente não estava no filtro
+        added = False
+        for position in self._positions(digest):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        return added
+
+    def contains_digest(self, digest):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def __contains__(self, item):
+        return self.contains_digest(url_digest(item))
+
+    def add(self, item):
+        return self.add_digest(url_digest(item))
+
+    @property
+    def memory(self):
+        return len(self._bits)
+
+
+class VisitedSet:
+    # URLs já vistas, com memória limitada: o filtro de Bloom responde "nunca vista" sem
+    # tocar no disco, e só as possíveis repetições são confirmadas no SQLite, que guarda
+    # um digest de 16 bytes por URL. Interface de set (in, add, update, len) para o WorkScheduler.
+
+    def __init__(self, capacity=BLOOM_CAPACITY, path=None):
+        self._bloom = BloomFilter(capacity)
+        self._temporary = path is None
+        if path is None:
+            descriptor, path = tempfile.mkstemp(prefix='was-visited-', suffix='.db')
+            os.close(descriptor)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS visited (digest BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._lock = Lock()
+        self._pending = 0
+        self._length = self._connection.execute("SELECT COUNT(*) FROM visited").fetchone()[0]
+        for (digest,) in self._connection.execute("SELECT digest FROM visited"):
+            self._bloom.add_digest(digest)
+        self.stats = {"bloom_negatives": 0, "disk_lookups": 0, "false_positives": 0}
+
+    def _stored(self, digest):
+        self.stats["disk_lookups"] += 1
+        found = self._connection.execute("SELECT 1 FROM visited WHERE digest = ?", (digest,)).fetchone() is not None
+        if not found:
+            self.stats["false_positives"] += 1
+        return found
+
+    def __contains__(self, url):
+        digest = url_digest(url)
+        with self._lock:
+            if not self._bloom.contains_digest(digest):
+                self.stats["bloom_negatives"] += 1
+                return False
+            return self._stored(digest)
+
+    def add(self, url):
+        # Devolve True se a URL era nova
+        digest = url_digest(url)
+        with self._lock:
+            if not self._bloom.add_digest(digest):
+                if self._stored(digest):
+                    return False
+            else:
+                self.stats["bloom_negatives"] += 1
+            self._connection.execute("INSERT OR IGNORE INTO visited VALUES (?)", (digest,))
+            self._length += 1
+            self._pending += 1
+            if self._pending >= COMMIT_EVERY:
+                self._connection.commit()
+                self._pending = 0
+            return True
+
+    def update(self, urls):
+        for url in urls:
+            self.add(url)
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def memory(self):
+        return self._bloom.memory
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+        if self._temporary:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class UrlFrontier:
+    # Fila FIFO (ordem de busca em largura) de URLs ainda não visitadas. Até MEMORY_QUEUE
+    # itens ficam em memória; o excedente é gravado no SQLite do VisitedSet e lido de volta
+    # em lotes, na mesma ordem, quando a parte em memória esvazia.
+
+    def __init__(self, visited=None, memory_queue=MEMORY_QUEUE):
+        self.visited = visited if visited is not None else VisitedSet()
+        self.memory_queue = memory_queue
+        self._queue = deque()
+        self._spilled = 0
+        self._connection = self.visited._connection
+        self._connection.execute("CREATE TABLE IF NOT EXISTS pending (id INTEGER PRIMARY KEY, url TEXT, depth INTEGER)")
+
+    def push(self, url, depth):
+        if not self.visited.add(url):
+            return False
+        if self._spilled or len(self._queue) >= self.memory_queue:
+            with self.visited._lock:
+                self._connection.execute("INSERT INTO pending (url, depth) VALUES (?, ?)", (url, depth))
+            self._spilled += 1
+        else:
+            self._queue.append((url, depth))
+        return True
+
+    def _refill(self):
+        with self.visited._lock:
+            rows = self._connection.execute("SELECT id, url, depth FROM pending ORDER BY id LIMIT ?",
+                                            (REFILL_BATCH,)).fetchall()
+            if rows:
+                self._connection.execute("DELETE FROM pending WHERE id <= ?", (rows[-1][0],))
+        self._spilled -= len(rows)
+        self._queue.extend((url, depth) for _, url, depth in rows)
+
+    def pop(self):
+        if not self._queue and self._spilled:
+            self._refill()
+        return self._queue.popleft() if self._queue else None
+
+    def __len__(self):
+        return len(self._queue) + self._spilled
+
+    def close(self):
+        self.visited.close()
@@ -0,0 +1,134 @@
+import mmap
+import os
+from itertools import islice
+
+SECLIST_DIR = os.path.join(os.path.dirname(__file__), 'SecList')
+INDEX_STRIDE = 4096  # Um offset guardado a cada N entradas: índice esparso, memória ~constante
+RELEASE_WINDOW = 8 * 1024 * 1024  # Páginas já lidas são devolvidas ao kernel a cada 8 MiB
+
+
+def seclist_path(*parts):
+    return os.path.join(SECLIST_DIR, *parts)
+
+
+def strip_entry(line):
+    line = line.strip()
+    return line or None
+
+
+def parse_credential(line):
+    line = line.strip()
+    if ':' not in line:
+        return None
+    return line.split(':', 1)
+
+
+class Wordlist:
+    # Lista de palavras lida sob demanda a partir de um arquivo mapeado em memória.
+    # Nada é carregado para listas Python: cada iteração percorre o mmap linha a linha,
+    # e o acesso por índice/fatia usa um índice esparso de offsets.
+
+    def __init__(self, path, parse=strip_entry, encoding='latin-1'):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"O arquivo '{os.path.basename(path)}' não foi encontrado em: {path}")
+        self.path = path
+        self.parse = parse
+        self.encoding = encoding
+        self._length = None
+        self._checkpoints = None
+
+    def _map(self):
+        with open(self.path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return None
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        return mapped
+
+    @staticmethod
+    def _release(mapped, released, position):
+        # Mantém o RSS estável em listas enormes: descarta do mapeamento as páginas já consumidas
+        boundary = position - position % mmap.PAGESIZE
+        if hasattr(mmap, 'MADV_DONTNEED') and boundary > released:
+            mapped.madvise(mmap.MADV_DONTNEED, released, boundary - released)
+        return boundary
+
+    def _iter_offsets(self, start=0, end=None):
+        # Gera (offset, entrada) para as linhas que começam em [start, end)
+        mapped = self._map()
+        if mapped is None:
+            return
+        try:
+            size = len(mapped)
+            end = size if end is None else min(end, size)
+            if start > 0 and mapped[start - 1:start] != b'\n':
+                # Alinha no início da próxima linha; a linha cortada pertence ao shard anterior
+                newline = mapped.find(b'\n', start)
+                if newline == -1:
+                    return
+                start = newline + 1
+            position = start
+            released = start - start % mmap.PAGESIZE
+            while position < end:
+                newline = mapped.find(b'\n', position)
+                if newline == -1:
+                    newline = size
+                entry = self.parse(mapped[position:newline].decode(self.encoding))
+                if entry is not None:
+                    yield position, entry
+                position = newline + 1
+                if position - released >= RELEASE_WINDOW:
+                    released = self._release(mapped, released, position)
+        finally:
+            mapped.close()
+
+    def __iter__(self):
+        for _, entry in self._iter_offsets():
+            yield entry
+
+    def _build_index(self):
+        checkpoints = []
+        count = 0
+        for offset, _ in self._iter_offsets():
+            if count % INDEX_STRIDE == 0:
+                checkpoints.append(offset)
+            count += 1
+        self._checkpoints = checkpoints
+        self._length = count
+
+    def __len__(self):
+        if self._length is None:
+            self._build_index()
+        return self._length
+
+    def slice(self, start=0, stop=None):
+        # Itera as entradas [start, stop) partindo do checkpoint mais próximo
+        if self._checkpoints is None:
+            self._build_index()
+        if start >= self._length:
+            return iter(())
+        checkpoint = start // INDEX_STRIDE
+        entries = (entry for _, entry in self._iter_offsets(self._checkpoints[checkpoint]))
+        skip = start - checkpoint * INDEX_STRIDE
+        return islice(entries, skip, None if stop is None else skip + max(stop - start, 0))
+
+    def shard(self, index, count):
+        # Divide o arquivo em `count` faixas de bytes; cada shard é iterado de forma independente
+        size = os.path.getsize(self.path)
+        start = size * index // count
+        end = size * (index + 1) // count
+        for _, entry in self._iter_offsets(start, end):
+            yield entry
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step <= 0:
+                return list(self)[key]
+            return list(islice(self.slice(start, stop), 0, None, step))
+        if key < 0:
+            key += len(self)
+        if key < 0 or key >= len(self):
+            raise IndexError("índice fora da wordlist")
+        return next(self.slice(key, key + 1))
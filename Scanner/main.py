@@ -1,13 +1,11 @@
 from lib.http_requests import fetch_url
+from lib.http_client import clear_cache, print_connection_stats
 from lib.security_headers import check_security_headers, analyze_cookies
-from lib.directory_enumeration import directory_enumeration
-from lib.injection_tests import test_sqli
-from lib.content_analysis import analyze_content
-from lib.authentication_tests import test_authentication
-from lib.performance_tests import performance_test_menu
-from lib.subdomain_discovery import run_subdomain_discovery
 import json
 
+# Os módulos de teste (bs4, aiohttp, wordlists) são importados apenas quando a opção
+# correspondente é escolhida, para que o menu apareça sem esperar por eles.
+
 
 def display_logo():
     """Displays the logo and title of the web asset scanner.
@@ -62,6 +60,12 @@ def menu():
     return choice
 
 
+def ask_checkpoint():
+    # Scans longos podem gravar o progresso em SQLite e retomar de onde pararam
+    path = input("Arquivo de checkpoint para salvar/retomar (Enter para não usar): ").strip()
+    return path or None
+
+
 def execute_choice(choice, url, response):
     """
     Executes a specific choice based on the given input.
@@ -81,25 +85,56 @@ def execute_choice(choice, url, response):
         result = analyze_cookies(response.headers)
         print(json.dumps(result, indent=4, ensure_ascii=False))
     elif choice == '3':
-        directory_enumeration(url)
+        if input("Usar modo assíncrono? (s/N): ").strip().lower() == 's':
+            from lib.async_directory_enumeration import async_directory_enumeration
+            async_directory_enumeration(url)
+        else:
+            from lib.directory_enumeration import directory_enumeration
+            directory_enumeration(url, checkpoint=ask_checkpoint())
     elif choice == '4':
-        test_sqli(url)
+        from lib.injection_tests import test_sqli
+        test_sqli(url, html=response.text)
+        if input("Incluir teste time-based (blind)? (s/N): ").strip().lower() == 's':
+            from lib.blind_sqli import test_blind_sqli
+            test_blind_sqli(url, html=response.text)
     elif choice == '5':
-        analyze_content(response.text)
+        if input("Rastrear o site inteiro (crawler)? (s/N): ").strip().lower() == 's':
+            from lib.crawler import crawl_site
+            output = input("Arquivo JSON Lines para a análise de cada página (Enter para não gravar): ").strip()
+            crawl_site(url, output=output or None)
+        elif input("Analisar em streaming (páginas muito grandes)? (s/N): ").strip().lower() == 's':
+            from lib.content_stream import analyze_url
+            analyze_url(url)
+        else:
+            from lib.content_analysis import analyze_content
+            analyze_content(response.text)
     elif choice == '6':
-        test_authentication(url)
+        from lib.authentication_tests import test_authentication
+        test_authentication(url, checkpoint=ask_checkpoint(), html=response.text)
     elif choice == '7':
+        from lib.performance_tests import performance_test_menu
         performance_test_menu(url)
     elif choice == '8':
+        from lib.subdomain_discovery import run_subdomain_discovery
         run_subdomain_discovery(url)
     elif choice == '9':
+        from lib.directory_enumeration import directory_enumeration
+        from lib.injection_tests import test_sqli
+        from lib.content_analysis import analyze_content
+        from lib.authentication_tests import test_authentication
+        from lib.performance_tests import performance_test_menu
+        from lib.subdomain_discovery import run_subdomain_discovery
+        from lib.scan_context import ScanContext
         result_headers = check_security_headers(response.headers)
         result_cookies = analyze_cookies(response.headers)
         print(json.dumps({"security_headers": result_headers, "cookies": result_cookies}, indent=4, ensure_ascii=False))
-        directory_enumeration(url)
-        test_sqli(url)
-        analyze_content(response.text)
-        test_authentication(url)
+        # Um contexto por execução: os módulos compartilham soft-404 e orçamento, nunca com outra execução
+        with ScanContext(url) as context:
+            directory_enumeration(url, context=context)
+            # A página inicial já baixada em main() é reaproveitada por todos os módulos
+            test_sqli(url, context=context, html=response.text)
+            analyze_content(response.text)
+            test_authentication(url, context=context, html=response.text)
         performance_test_menu(url)
         run_subdomain_discovery(url)
     elif choice == '10':
@@ -132,9 +167,12 @@ def main(url):
         else:
             choice = last_choice
 
+        clear_cache()
         if not execute_choice(choice, url, response):
             break
 
+        print_connection_stats()
+
         print("\nDeseja realizar outra ação?")
         print("1. Refazer o teste com a URL atual")
         print("2. Refazer o teste com outra URL")
@@ -161,7 +199,17 @@ def main(url):
             break
 
 
+def scan_many(targets):
+    # Vários alvos informados de uma vez: escaneados em paralelo, cada um com o seu ScanContext
+    from lib.multi_scan import run_targets
+    run_targets(targets)
+    print_connection_stats()
+
+
 if __name__ == "__main__":
     display_logo()
-    url = input("Digite a URL para scanear: ")
-    main(url)
+    targets = input("Digite a URL para scanear (ou várias, separadas por espaço): ").replace(',', ' ').split()
+    if len(targets) > 1:
+        scan_many(targets)
+    else:
+        main(targets[0] if targets else '')